@@ -0,0 +1,69 @@
+"""Steady-state allocation check of the ``ExampleClass`` return methods.
+
+Each call is warmed up, then repeated many times under ``tracemalloc`` while
+every result is kept alive in a preallocated list. A call that returns a
+shared object leaves the traced memory unchanged, while a call that returns a
+new object makes it grow linearly with the number of calls, even if the
+object would be recycled by a free list otherwise. The check fails if the
+traced memory grew by more than a small constant.
+
+Examples:
+    Run the check from the root of the repository::
+
+        $ python -m benchmarks.allocations
+"""
+import argparse
+import sys
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+from docs_example.style_guide import ExampleClass
+
+# the bytes that the loop itself may allocate, e.g. for its frame
+SLACK = 1024
+
+
+def measure(func: Callable[[], object], calls: int = 100000) -> int:
+    """Return the growth of the traced memory over ``calls`` calls of
+    ``func`` whose results are kept alive."""
+    for _ in range(100):
+        func()
+    results = [None] * calls
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(calls):
+            results[i] = func()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return after - before
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Check that ExampleClass return methods do not allocate.')
+    parser.add_argument('--calls', type=int, default=100000)
+    args = parser.parse_args(args)
+
+    obj = ExampleClass(1)
+    arg3: dict = {}
+    checks: Dict[str, Callable[[], object]] = {
+        'return_dict(frozen=True)':
+        lambda: obj.return_dict(1, 'a', arg3, frozen=True),
+        'return_string': lambda: obj.return_string(1, 'a', arg3),
+        'return_tuple': lambda: obj.return_tuple(),
+    }
+    failures: List[str] = []
+    for name, func in checks.items():
+        growth = measure(func, args.calls)
+        print(f'{name}: {growth} bytes over {args.calls} calls')
+        if growth > SLACK:
+            failures.append(name)
+    for name in failures:
+        print(f'FAILED: {name} allocates')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Scaling benchmark of the concurrent greetings from 1 to N threads.
+
+Each thread calls a greeting function many times, writing to /dev/null. The
+plain functions write through the lock of ``sys.stdout`` on every call,
+while the concurrent ones commit to a shared
+:class:`~docs_example.greeting.CoalescingWriter`.
+
+Examples:
+    Run the benchmark from the root of the repository::
+
+        $ python -m benchmarks.concurrent_writers
+        $ python -m benchmarks.concurrent_writers --calls 100000 --n 10
+"""
+import argparse
+import contextlib
+import os
+import threading
+import time
+from typing import Callable, Optional, Sequence
+
+from docs_example.example1 import say_hello, say_hello_concurrent
+from docs_example.example2 import say_hi, say_hi_concurrent
+from docs_example.greeting import CoalescingWriter
+
+
+def run_threads(func: Callable[[], None], num_threads: int) -> float:
+    """Run ``func`` in ``num_threads`` threads and return the seconds."""
+    threads = [threading.Thread(target=func) for _ in range(num_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main(args: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Measure the scaling of the concurrent greetings.')
+    parser.add_argument(
+        '--calls', type=int, default=20000, help='calls per thread')
+    parser.add_argument('--n', type=int, default=10, help='lines per call')
+    parser.add_argument('--max-threads', type=int, default=os.cpu_count())
+    args = parser.parse_args(args)
+
+    print(f'{args.calls} calls of {args.n} lines per thread, '
+          f'{os.cpu_count()} CPUs')
+    print(f"{'function':>22} {'threads':>7} {'calls/s':>12} {'speedup':>8}")
+    with open(os.devnull, 'w') as devnull:
+        for name, plain, concurrent in (('say_hello', say_hello,
+                                         say_hello_concurrent),
+                                        ('say_hi', say_hi, say_hi_concurrent)):
+
+            def call_plain():
+                for _ in range(args.calls):
+                    plain(args.n)
+
+            for label, concurrent_mode in ((name, False),
+                                           (f'{name}_concurrent', True)):
+                baseline = None
+                for num_threads in range(1, args.max_threads + 1):
+                    if concurrent_mode:
+                        writer = CoalescingWriter(devnull)
+
+                        def work():
+                            for _ in range(args.calls):
+                                concurrent(args.n, writer)
+                            writer.flush()
+
+                        seconds = run_threads(work, num_threads)
+                        writer.close()
+                    else:
+                        with contextlib.redirect_stdout(devnull):
+                            seconds = run_threads(call_plain, num_threads)
+                    rate = args.calls * num_threads / seconds
+                    baseline = baseline or rate
+                    print(f'{label:>22} {num_threads:>7} {rate:>12.0f} '
+                          f'{rate / baseline:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""Import time regression check for ``docs_example``.
+
+Each statement is run in a fresh interpreter with ``python -X importtime``.
+The check fails if a statement imports a module that it must not import, or
+if its best cumulative import time over several runs exceeds its budget.
+
+Examples:
+    Run the check from the root of the repository::
+
+        $ python -m benchmarks.import_time
+        $ python -m benchmarks.import_time --repeat 10 --scale 2
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# statement -> (top level module to time, budget in microseconds, modules
+# that must not be imported)
+CHECKS = {
+    'import docs_example': (
+        'docs_example',
+        5000,
+        ('docs_example.example1', 'docs_example.example2',
+         'docs_example.style_guide', 'docs_example.greeting', 'typing',
+         'asyncio'),
+    ),
+    'from docs_example.example1 import say_hello': (
+        'docs_example.example1',
+        20000,
+        ('docs_example.example2', 'docs_example.style_guide', 'typing',
+         'asyncio', 'tempfile'),
+    ),
+    'import docs_example.style_guide': (
+        'docs_example.style_guide',
+        30000,
+        ('docs_example.style_guide.compact',
+         'docs_example.style_guide.serialization',
+         'docs_example.style_guide.parallel', 'pickle', 'mmap', 'struct',
+         'concurrent.futures'),
+    ),
+    # the modules imported by the generate subcommand of the console script
+    "from docs_example.cli import main; main(['generate', '0'])": (
+        'docs_example.style_guide',
+        30000,
+        ('docs_example.style_guide.compact',
+         'docs_example.style_guide.serialization',
+         'docs_example.style_guide.parallel', 'docs_example.example1',
+         'docs_example.example2', 'docs_example.greeting', 'pickle', 'mmap',
+         'struct', 'concurrent.futures'),
+    ),
+    'import docs_example.docindex': (
+        'docs_example.docindex',
+        20000,
+        ('docs_example.style_guide', 'typing', 'pickle', 'ast', 'inspect',
+         'hashlib'),
+    ),
+}
+
+
+def measure(statement: str,
+            python: str = sys.executable) -> Dict[str, Tuple[int, int]]:
+    """Run ``statement`` in a fresh interpreter and parse its import times.
+
+    Args:
+        statement (str): The Python statement to run.
+        python (str): The Python interpreter. Defaults to ``sys.executable``.
+
+    Returns:
+        dict: Map each imported module to its ``(self, cumulative)`` import
+        time in microseconds.
+    """
+    proc = subprocess.run([python, '-X', 'importtime', '-c', statement],
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE,
+                          universal_newlines=True,
+                          check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def check(statement: str,
+          module: str,
+          budget_us: int,
+          forbidden: Sequence[str] = (),
+          repeat: int = 5) -> List[str]:
+    """Check the import time of ``statement`` against its budget.
+
+    The first run also warms up the bytecode cache, so the best of ``repeat``
+    runs is compared to the budget.
+
+    Args:
+        statement (str): The Python statement to run.
+        module (str): The top level module whose cumulative time is checked.
+        budget_us (int): The budget in microseconds.
+        forbidden (Sequence[str]): Modules that must not be imported.
+            Defaults to ().
+        repeat (int): Number of runs. Defaults to 5.
+
+    Returns:
+        list[str]: The failures, empty if the check passed.
+    """
+    runs = [measure(statement) for _ in range(repeat)]
+    failures = [
+        f'{statement!r} imports {name}' for name in forbidden
+        if name in runs[0]
+    ]
+    if any(module not in run for run in runs):
+        # e.g. imported through importlib.import_module, which -X importtime
+        # does not report
+        return failures + [f'{statement!r} does not import {module}']
+    best = min(run[module][1] for run in runs)
+    print(f'{statement!r}: {best} us (budget {budget_us} us)')
+    if best > budget_us:
+        failures.append(
+            f'{statement!r} takes {best} us, over the budget of '
+            f'{budget_us} us')
+    return failures
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Check the import time of docs_example.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=1.0,
+        help='multiply every budget, e.g. for slow machines')
+    args = parser.parse_args(args)
+
+    failures = []
+    for statement, (module, budget_us, forbidden) in CHECKS.items():
+        failures += check(statement, module, int(budget_us * args.scale),
+                          forbidden, args.repeat)
+    for failure in failures:
+        print(f'FAILED: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
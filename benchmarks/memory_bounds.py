@@ -0,0 +1,229 @@
+"""Memory-bound regression check of the streaming APIs.
+
+Each API that should run in constant memory is run at increasing input
+sizes under ``tracemalloc``. A straight line is fitted to its peak memory
+against the input size, and the check fails if the fitted growth over the
+range of sizes exceeds a small budget.
+
+Note:
+    ``tracemalloc`` only traces the memory allocated by Python. Memory
+    mapped by ``mmap``, such as the template block of ``say_hi_zero_copy``,
+    is not traced, but its size does not depend on the input either.
+
+Examples:
+    Run the check from the root of the repository::
+
+        $ python -m benchmarks.memory_bounds
+
+    Guard a new API with the helper::
+
+        >>> from benchmarks.memory_bounds import assert_memory_bound
+        >>> def consume(n):
+        ...     for _ in range(n):
+        ...         pass
+        >>> peaks = assert_memory_bound(consume, [1000, 10000, 100000])
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+from docs_example.example1 import hello
+from docs_example.example2 import hi
+from docs_example.greeting import CoalescingWriter, default_engine
+from docs_example.style_guide import (ExampleSequence, example_generator,
+                                      example_generator_batched)
+
+DEFAULT_MAX_GROWTH = 64 * 1024
+# lines per call and queue budget of the concurrent greetings checks
+CONCURRENT_LINES = 100
+CONCURRENT_QUEUED_BYTES = 64 * 1024
+
+
+def measure_peak(func: Callable[[int], object], n: int) -> int:
+    """Return the peak memory in bytes traced while calling ``func(n)``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        func(n)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - base
+
+
+def fit_slope(xs: Sequence[float], ys: Sequence[float]) -> float:
+    """Return the slope of the least-squares line through the points."""
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x)**2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def assert_memory_bound(func: Callable[[int], object],
+                        sizes: Sequence[int],
+                        max_growth: int = DEFAULT_MAX_GROWTH,
+                        max_peak: Optional[int] = None,
+                        name: Optional[str] = None) -> List[int]:
+    """Assert that ``func(n)`` runs in constant memory with respect to n.
+
+    ``func`` is called once with the smallest size to warm up caches, then
+    once per size while tracing its peak memory.
+
+    Args:
+        func (callable): The function to check, called with each size.
+        sizes (Sequence[int]): At least two increasing input sizes, which
+            should span at least one order of magnitude.
+        max_growth (int): The maximum growth in bytes of the fitted peak
+            memory from the smallest to the largest size. Defaults to 65536.
+        max_peak (int, optional): If given, the maximum peak memory in bytes
+            at any size. Defaults to None.
+        name (str, optional): The name of ``func`` in error messages.
+            Defaults to None, which means ``func.__name__``.
+
+    Returns:
+        list[int]: The peak memory in bytes at each size.
+
+    Raises:
+        AssertionError: If the peak memory grows with the input size, or
+            exceeds ``max_peak``.
+    """
+    if len(sizes) < 2:
+        raise ValueError('at least two sizes are needed to fit a slope')
+    func(sizes[0])
+    peaks = [measure_peak(func, n) for n in sizes]
+    growth = fit_slope(sizes, peaks) * (max(sizes) - min(sizes))
+    if name is None:
+        name = getattr(func, '__name__', repr(func))
+    details = ', '.join(f'n={n}: {peak} B' for n, peak in zip(sizes, peaks))
+    if growth > max_growth:
+        raise AssertionError(
+            f'{name} is not constant-memory: its peak grows by {growth:.0f} '
+            f'B over the sizes, more than {max_growth} B ({details})')
+    if max_peak is not None and max(peaks) > max_peak:
+        raise AssertionError(
+            f'{name} peaks at {max(peaks)} B, more than {max_peak} B '
+            f'({details})')
+    return peaks
+
+
+class _NullSink:
+    """An async sink which discards the data."""
+
+    def write(self, data: bytes) -> None:
+        pass
+
+    async def drain(self) -> None:
+        pass
+
+
+def build_checks(devnull) -> Dict[str, tuple]:
+    """Return each API to check with its input sizes.
+
+    An API whose memory may grow up to a bound, rather than stay constant,
+    also has that bound in bytes as a third item.
+
+    Args:
+        devnull (IO): An open text stream to ``os.devnull``.
+    """
+    # above the cache budget of the engine, where payloads are streamed
+    lines = default_engine.max_bytes // 2
+    greeting_sizes = [lines, lines * 2, lines * 4]
+    # below the budget, where payloads are rendered whole and cached, so the
+    # peak grows with n but stays within the budget
+    cached_sizes = [lines // 64, lines // 16, lines // 4]
+    cached_peak = default_engine.max_bytes + DEFAULT_MAX_GROWTH
+    sizes = [10000, 100000, 1000000]
+    # whole blocks, so that every size reuses the cached block of the warm-up,
+    # and several of them, since a consumer holds one while the next is built
+    block_sizes = [65536 * 4, 65536 * 16, 65536 * 64]
+    # numbers of calls, which commit far more than the queue budget
+    concurrent_sizes = [5000, 20000, 80000]
+
+    def say_hello(n):
+        with contextlib.redirect_stdout(devnull):
+            hello.say_hello(n)
+
+    def say_hi(n):
+        with contextlib.redirect_stdout(devnull):
+            hi.say_hi(n)
+
+    def concurrent(func):
+        # n calls through a writer with a small queue budget, so that the
+        # queue must stay bounded however many calls are committed
+        def run(n):
+            writer = CoalescingWriter(
+                devnull, max_queued_bytes=CONCURRENT_QUEUED_BYTES)
+            with writer:
+                for _ in range(n):
+                    func(CONCURRENT_LINES, writer)
+
+        return run
+
+    def consume(iterable):
+        for _ in iterable:
+            pass
+
+    return {
+        'say_hello': (say_hello, greeting_sizes),
+        'say_hi': (say_hi, greeting_sizes),
+        'say_hello[cached]': (say_hello, cached_sizes, cached_peak),
+        'say_hi[cached]': (say_hi, cached_sizes, cached_peak),
+        'say_hello_bulk': (lambda n: hello.say_hello_bulk(n, devnull), sizes),
+        'say_hi_zero_copy':
+        (lambda n: hi.say_hi_zero_copy(n, devnull), greeting_sizes),
+        'say_hello_async':
+        (lambda n: asyncio.run(hello.say_hello_async(n, _NullSink())), sizes),
+        'say_hi_async':
+        (lambda n: asyncio.run(hi.say_hi_async(n, _NullSink())), sizes),
+        'say_hello_concurrent':
+        (concurrent(hello.say_hello_concurrent), concurrent_sizes),
+        'say_hi_concurrent':
+        (concurrent(hi.say_hi_concurrent), concurrent_sizes),
+        'example_generator':
+        (lambda n: consume(example_generator(n)), sizes),
+        'example_generator_batched':
+        (lambda n: consume(example_generator_batched(n)), block_sizes),
+        'ExampleSequence': (lambda n: consume(ExampleSequence(n)), sizes),
+    }
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Check that streaming APIs run in constant memory.')
+    parser.add_argument('--max-growth', type=int, default=DEFAULT_MAX_GROWTH)
+    parser.add_argument(
+        '--filter', help='only check the APIs whose name contains it')
+    args = parser.parse_args(args)
+
+    failures = []
+    with open(os.devnull, 'w') as devnull:
+        for name, (func, sizes, *bound) in build_checks(devnull).items():
+            if args.filter and args.filter not in name:
+                continue
+            # a bounded API may grow up to its bound, but not beyond it
+            max_growth = bound[0] if bound else args.max_growth
+            try:
+                peaks = assert_memory_bound(
+                    func,
+                    sizes,
+                    max_growth,
+                    max_peak=bound[0] if bound else None,
+                    name=name)
+            except AssertionError as e:
+                failures.append(name)
+                print(f'FAILED: {e}')
+            else:
+                print(f'{name}: peaks {peaks} B at n={sizes}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
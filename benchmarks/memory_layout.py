@@ -0,0 +1,83 @@
+"""Memory benchmark of the layouts of ``ExampleClass`` collections.
+
+For each number of rows, a collection is built with each layout and the
+memory it holds is measured with ``tracemalloc``:
+
+- dict: a list of :class:`ExampleClass`, each with its own ``__dict__``.
+- slots: a list of :class:`SlottedExampleClass`.
+- columnar: an :class:`ExampleClassArray`.
+
+The rows cycle through a few distinct strings, like real data usually does.
+
+Examples:
+    Run the benchmark from the root of the repository::
+
+        $ python -m benchmarks.memory_layout
+        $ python -m benchmarks.memory_layout --rows 1000000 10000000
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, Dict, Optional, Sequence
+
+from docs_example.style_guide import ExampleClass
+from docs_example.style_guide.compact import (ExampleClassArray,
+                                              SlottedExampleClass)
+
+ARG2_VALUES = (None, 'second parameter', 'another parameter')
+ARG3_VALUES = ('item1', 'item2')
+
+
+def build_objects(cls: type, rows: int) -> list:
+    return [
+        cls(i, ARG2_VALUES[i % len(ARG2_VALUES)],
+            ARG3_VALUES[i % len(ARG3_VALUES)]) for i in range(rows)
+    ]
+
+
+def build_array(rows: int) -> ExampleClassArray:
+    array = ExampleClassArray()
+    for i in range(rows):
+        array.append(i, ARG2_VALUES[i % len(ARG2_VALUES)],
+                     ARG3_VALUES[i % len(ARG3_VALUES)])
+    return array
+
+
+LAYOUTS: Dict[str, Callable[[int], object]] = {
+    'dict': lambda rows: build_objects(ExampleClass, rows),
+    'slots': lambda rows: build_objects(SlottedExampleClass, rows),
+    'columnar': build_array,
+}
+
+
+def measure(build: Callable[[int], object], rows: int) -> int:
+    """Return the bytes held by the collection that ``build`` returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        collection = build(rows)  # noqa: F841
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size
+
+
+def main(args: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Compare the memory of ExampleClass layouts.')
+    parser.add_argument(
+        '--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument(
+        '--layouts', nargs='+', choices=list(LAYOUTS), default=list(LAYOUTS))
+    args = parser.parse_args(args)
+
+    print(f"{'rows':>12} {'layout':>10} {'MiB':>10} {'bytes/row':>10}")
+    for rows in args.rows:
+        for name in args.layouts:
+            size = measure(LAYOUTS[name], rows)
+            print(f'{rows:>12} {name:>10} {size / 2**20:>10.1f} '
+                  f'{size / rows:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
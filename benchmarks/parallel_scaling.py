@@ -0,0 +1,52 @@
+"""Scaling benchmark of the batch executor from 1 to N workers.
+
+Examples:
+    Run the benchmark from the root of the repository::
+
+        $ python -m benchmarks.parallel_scaling
+        $ python -m benchmarks.parallel_scaling --items 1000000 --max-workers 8
+"""
+import argparse
+import os
+import time
+from typing import Optional, Sequence
+
+from docs_example.style_guide.parallel import (map_example_class,
+                                               map_module_level_function)
+
+
+def main(args: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Measure the scaling of the batch executor.')
+    parser.add_argument('--items', type=int, default=200000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument(
+        '--executors', nargs='+', default=['process', 'thread'])
+    args = parser.parse_args(args)
+
+    workloads = {
+        'module_level_function':
+        lambda **kwargs: map_module_level_function(
+            ((i, i % 7) for i in range(args.items)), **kwargs),
+        'ExampleClass.return_string':
+        lambda **kwargs: map_example_class(
+            'return_string',
+            (((i, ), (i, 'a', {})) for i in range(args.items)), **kwargs),
+    }
+    print(f'{args.items} items, {os.cpu_count()} CPUs')
+    print(f"{'workload':>28} {'executor':>8} {'workers':>7} "
+          f"{'items/s':>12} {'speedup':>8}")
+    for name, workload in workloads.items():
+        for executor in args.executors:
+            baseline = None
+            for workers in range(1, args.max_workers + 1):
+                start = time.perf_counter()
+                workload(executor=executor, max_workers=workers)
+                rate = args.items / (time.perf_counter() - start)
+                baseline = baseline or rate
+                print(f'{name:>28} {executor:>8} {workers:>7} {rate:>12.0f} '
+                      f'{rate / baseline:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
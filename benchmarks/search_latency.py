@@ -0,0 +1,100 @@
+"""Latency check of the prebuilt search index of the docs.
+
+The documents of the docs of both languages are copied ``--copies`` times
+into one index, to stand for the docs of a larger project. The check fails
+if the median latency of a query exceeds its budget, and also reports the
+time of a full build and of an update after changing one document.
+
+Scoring costs about a microsecond per posting of the query terms, so the
+budget holds up to a few thousand postings per query.
+
+Examples:
+    Run the check from the root of the repository::
+
+        $ python -m benchmarks.search_latency
+        $ python -m benchmarks.search_latency --copies 100 --budget 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional, Sequence
+
+from docs_example.search import Document, SearchIndex, build_index
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'docs'))
+
+import search_index  # noqa: E402
+
+QUERIES = ('say_hello', 'say_hel', 'coalescing wri', 'GreetingEngine.say',
+           'docstring index', '如何说', '说 hi', 'mmap')
+
+
+def corpus(copies: int) -> List[Document]:
+    """Return the documents of both languages, copied ``copies`` times."""
+    documents = []
+    for language in search_index.LANGUAGES:
+        documents += [
+            document._replace(key=f'{language}:{document.key}')
+            for document in search_index.page_documents(language) +
+            search_index.api_documents(language)
+        ]
+    return [
+        document._replace(key=f'{i}:{document.key}')
+        for i in range(copies) for document in documents
+    ]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Return the ``fraction`` percentile of the samples."""
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Check the query latency of the search index.')
+    parser.add_argument('--copies', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument(
+        '--budget',
+        type=float,
+        default=1000,
+        help='budget of the median latency in microseconds')
+    args = parser.parse_args(args)
+
+    documents = corpus(args.copies)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'search.idx')
+        start = time.perf_counter()
+        build_index(path, documents)
+        full = time.perf_counter() - start
+        documents[0] = documents[0]._replace(text='changed')
+        start = time.perf_counter()
+        tokenized = build_index(path, documents)
+        update = time.perf_counter() - start
+        print(f'{len(documents)} documents, {os.path.getsize(path)} bytes: '
+              f'full build {full * 1000:.0f}ms, update of {tokenized} '
+              f'document {update * 1000:.0f}ms')
+
+        failures = 0
+        with SearchIndex(path) as index:
+            for query in QUERIES:
+                samples = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    hits = index.search(query)
+                    samples.append((time.perf_counter() - start) * 1e6)
+                p50 = percentile(samples, 0.5)
+                p99 = percentile(samples, 0.99)
+                failed = p50 > args.budget
+                failures += failed
+                print(f'{"FAIL" if failed else "ok":>4} {query!r:>22}: '
+                      f'{len(hits)} hits, p50 {p50:.0f}us, p99 {p99:.0f}us '
+                      f'(budget {args.budget:.0f}us)')
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(main())
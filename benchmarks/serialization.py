@@ -0,0 +1,81 @@
+"""Round-trip benchmark of ``save_many``/``load_many`` against pickle.
+
+Examples:
+    Run the benchmark from the root of the repository::
+
+        $ python -m benchmarks.serialization
+        $ python -m benchmarks.serialization --rows 1000000
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+from typing import Optional, Sequence
+
+from docs_example.style_guide import ExampleClass
+from docs_example.style_guide.serialization import load_many, save_many
+
+ARG2_VALUES = (None, 'second parameter', 'another parameter')
+ARG3_VALUES = ('item1', 'item2')
+
+
+def timeit(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(args: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Compare save_many/load_many with pickle.')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args(args)
+
+    objects = [
+        ExampleClass(i, ARG2_VALUES[i % len(ARG2_VALUES)],
+                     ARG3_VALUES[i % len(ARG3_VALUES)])
+        for i in range(args.rows)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pickle_path = os.path.join(tmpdir, 'objects.pkl')
+        binary_path = os.path.join(tmpdir, 'objects.bin')
+
+        def dump_pickle():
+            with open(pickle_path, 'wb') as f:
+                pickle.dump(objects, f, pickle.HIGHEST_PROTOCOL)
+
+        def load_pickle():
+            with open(pickle_path, 'rb') as f:
+                pickle.load(f)
+
+        def open_lazy():
+            load_many(binary_path).close()
+
+        def random_access():
+            with load_many(binary_path) as reader:
+                step = max(1, len(reader) // 1000)
+                for i in range(0, len(reader), step):
+                    reader[i]
+
+        results = [
+            ('pickle dump', timeit(dump_pickle)),
+            ('pickle load', timeit(load_pickle)),
+            ('save_many', timeit(lambda: save_many(objects, binary_path))),
+            ('load_many', timeit(lambda: load_many(binary_path, lazy=False))),
+            ('load_many lazy open', timeit(open_lazy)),
+            ('lazy 1000 random reads', timeit(random_access)),
+        ]
+        sizes = [('pickle', os.path.getsize(pickle_path)),
+                 ('save_many', os.path.getsize(binary_path))]
+
+    print(f'{args.rows} rows')
+    for name, seconds in results:
+        print(f'{name:>24}: {seconds * 1000:10.1f} ms')
+    for name, size in sizes:
+        print(f'{name + " size":>24}: {size / 2**20:10.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""Benchmark suite of the public API of ``docs_example``.
+
+Every name of ``docs_example.__all__`` is covered by at least one benchmark,
+and the suite refuses to run if a new public name is not. Each benchmark is
+timed with :mod:`timeit`, and the best time per operation over several
+repeats is reported, which is the least noisy estimate.
+
+Results are written as JSON and can be compared to a baseline saved from an
+earlier run, failing if any benchmark got slower than a threshold.
+
+Examples:
+    Save a baseline, then compare a later run against it::
+
+        $ python -m benchmarks --output baseline.json
+        $ python -m benchmarks --baseline baseline.json --threshold 0.1
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import timeit
+from typing import (Callable, Dict, List, NamedTuple, Optional, Sequence,
+                    TextIO)
+
+import docs_example
+from docs_example.example1 import hello
+from docs_example.example2 import hi
+from docs_example.style_guide import (ExampleClass, ExampleClassArray,
+                                      ExampleSequence, SlottedExampleClass,
+                                      example_generator,
+                                      example_generator_batched,
+                                      module_level_function,
+                                      module_level_function_batch)
+
+GREETING_SIZES = (1, 100, 10000, 1000000)
+
+
+class Benchmark(NamedTuple):
+    """A benchmark of one operation.
+
+    Attributes:
+        name (str): The unique name of the benchmark.
+        covers (str): The name of ``docs_example.__all__`` it covers.
+        setup (callable): Called once before timing. It returns the
+            operation to time, a callable without arguments.
+    """
+    name: str
+    covers: str
+    setup: Callable[[], Callable[[], object]]
+
+
+def _greeting(func: Callable[[int], None], n: int, devnull: TextIO):
+
+    def setup():
+
+        def run():
+            with contextlib.redirect_stdout(devnull):
+                func(n)
+
+        return run
+
+    return setup
+
+
+def _consume(iterable) -> None:
+    for _ in iterable:
+        pass
+
+
+def _sequence_index():
+    seq = ExampleSequence(10**9)
+    return lambda: seq[123456789]
+
+
+def _example_class_array():
+    rows = ExampleClassArray(ExampleClass(i) for i in range(1000))
+    return lambda: _consume(row.arg1 for row in rows)
+
+
+def build_benchmarks(devnull: TextIO) -> List[Benchmark]:
+    """Return the benchmarks of the suite.
+
+    Args:
+        devnull (TextIO): The file the greetings print to, which must stay
+            open while the benchmarks run.
+    """
+    obj = ExampleClass(1, 'second parameter')
+    arg3: dict = {}
+    pairs = (list(range(10000)), list(range(1, 10001)))
+    benchmarks = []
+    for n in GREETING_SIZES:
+        benchmarks += [
+            Benchmark(f'say_hello[n={n}]', 'hello',
+                      _greeting(hello.say_hello, n, devnull)),
+            Benchmark(f'say_hi[n={n}]', 'hi',
+                      _greeting(hi.say_hi, n, devnull)),
+        ]
+    benchmarks += [
+        Benchmark('say_hello_bulk[n=1000000]', 'hello',
+                  _greeting(hello.say_hello_bulk, 1000000, devnull)),
+        Benchmark('example_generator[n=100000]', 'example_generator',
+                  lambda: lambda: _consume(example_generator(100000))),
+        Benchmark(
+            'example_generator_batched[n=100000]',
+            'example_generator_batched',
+            lambda: lambda: _consume(example_generator_batched(100000))),
+        Benchmark('ExampleSequence[index]', 'ExampleSequence',
+                  _sequence_index),
+        Benchmark('module_level_function', 'module_level_function',
+                  lambda: lambda: module_level_function(1, 2)),
+        Benchmark('module_level_function_batch[n=10000]',
+                  'module_level_function_batch',
+                  lambda: lambda: module_level_function_batch(*pairs)),
+        Benchmark('ExampleClass()', 'ExampleClass',
+                  lambda: lambda: ExampleClass(1, 'second parameter')),
+        Benchmark('ExampleClass.owner', 'ExampleClass',
+                  lambda: lambda: obj.owner),
+        Benchmark('ExampleClass.return_string', 'ExampleClass',
+                  lambda: lambda: obj.return_string(1, 'a', arg3)),
+        Benchmark('ExampleClass.return_dict', 'ExampleClass',
+                  lambda: lambda: obj.return_dict(1, 'a', arg3)),
+        Benchmark('ExampleClass.return_dict[frozen]', 'ExampleClass',
+                  lambda: lambda: obj.return_dict(1, 'a', arg3, frozen=True)),
+        Benchmark('ExampleClass.return_tuple', 'ExampleClass',
+                  lambda: lambda: obj.return_tuple()),
+        Benchmark('SlottedExampleClass()', 'SlottedExampleClass',
+                  lambda: lambda: SlottedExampleClass(1, 'second parameter')),
+        Benchmark('ExampleClassArray[iterate n=1000]', 'ExampleClassArray',
+                  _example_class_array),
+    ]
+    return benchmarks
+
+
+def check_coverage(benchmarks: Sequence[Benchmark]) -> None:
+    """Check that every name of ``docs_example.__all__`` is benchmarked.
+
+    Raises:
+        ValueError: If a public name has no benchmark.
+    """
+    missing = set(docs_example.__all__) - {b.covers for b in benchmarks}
+    if missing:
+        raise ValueError(
+            f'no benchmark covers {sorted(missing)}, please add one to '
+            'benchmarks/suite.py')
+
+
+def run(benchmarks: Sequence[Benchmark],
+        repeat: int = 5,
+        min_time: float = 0.2) -> Dict[str, dict]:
+    """Time each benchmark.
+
+    Args:
+        benchmarks (Sequence[Benchmark]): The benchmarks to run.
+        repeat (int): The number of timing rounds. Defaults to 5.
+        min_time (float): The minimum duration in seconds of a round, which
+            sets the number of operations per round. Defaults to 0.2.
+
+    Returns:
+        dict: Map each benchmark name to a dict of its best ``seconds`` per
+        operation and the ``number`` of operations per round.
+    """
+    results = {}
+    for benchmark in benchmarks:
+        timer = timeit.Timer(benchmark.setup())
+        number, elapsed = timer.autorange()
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+        best = min(timer.repeat(repeat, number)) / number
+        results[benchmark.name] = {'seconds': best, 'number': number}
+        print(f'{benchmark.name:>40}: {best * 1e6:12.3f} us')
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict],
+            threshold: float) -> List[str]:
+    """Compare results with a baseline.
+
+    Args:
+        results (dict): The ``results`` of the current run.
+        baseline (dict): The ``results`` of the baseline run.
+        threshold (float): The tolerated relative slowdown, e.g. 0.1 for
+            10%.
+
+    Returns:
+        list[str]: A description of each regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]['seconds'], result['seconds']
+        change = new / old - 1 if old else 0.0
+        marker = ''
+        if change > threshold:
+            marker = '  REGRESSION'
+            regressions.append(
+                f'{name}: {old * 1e6:.3f} us -> {new * 1e6:.3f} us '
+                f'({change:+.1%})')
+        print(f'{name:>40}: {change:+8.1%}{marker}')
+    return regressions
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmark the public API of docs_example.')
+    parser.add_argument(
+        '--output', help='write the results as JSON to this file')
+    parser.add_argument(
+        '--baseline', help='compare the results with this JSON file')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help='tolerated relative slowdown against the baseline')
+    parser.add_argument(
+        '--filter', help='only run the benchmarks whose name contains it')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2)
+    args = parser.parse_args(args)
+
+    with open(os.devnull, 'w') as devnull:
+        benchmarks = build_benchmarks(devnull)
+        check_coverage(benchmarks)
+        if args.filter:
+            benchmarks = [b for b in benchmarks if args.filter in b.name]
+
+        results = run(benchmarks, args.repeat, args.min_time)
+    report = {
+        'python': sys.version,
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        print(f'compared with {args.baseline}:')
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} regression(s) over '
+                  f'{args.threshold:.0%}:')
+            for regression in regressions:
+                print(f'  {regression}')
+            return 1
+    return 0
@@ -0,0 +1,192 @@
+"""Sphinx extension generating the autosummary stubs incrementally.
+
+By default, ``sphinx.ext.autosummary`` generates the stub page of every
+object listed in an ``autosummary`` directive with a ``:toctree:`` on each
+build, and autodoc makes every stub depend on the whole module file of its
+object. Editing one function therefore re-reads the stubs of every object of
+the module, and the pages linking to them.
+
+When ``autosummary_incremental`` is True, this extension replaces the
+generation of autosummary:
+
+- The stubs are rendered by autosummary into a temporary directory.
+- Each stub is stamped with a hash of the source code and the docstring of
+  its object, and of the rendered stub itself.
+- A stub is only written if its content, hence its hash, changed.
+- The stubs no longer depend on the module files of their objects, only on
+  their own modification time.
+
+So a no-op rebuild writes and re-reads no stub, and a change to one object
+only re-reads its own stub.
+"""
+import hashlib
+import inspect
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+HASH_MARKER = 'autosummary-hash:'
+
+
+def object_hash(name: str, content: str) -> str:
+    """Return the hash of a stub and of the object it documents.
+
+    Args:
+        name (str): The fully qualified name of the object.
+        content (str): The rendered stub.
+
+    Returns:
+        str: The hex digest of the source code and docstring of the object,
+        if it can be imported, and of ``content``.
+    """
+    from sphinx.ext.autosummary import import_by_name
+
+    digest = hashlib.sha256(content.encode())
+    try:
+        obj = import_by_name(name)[1]
+    except Exception:
+        # ImportError, or ImportExceptionGroup since Sphinx 4.3
+        return digest.hexdigest()
+    try:
+        source = inspect.getsource(obj)
+    except (OSError, TypeError):
+        source = ''
+    digest.update(source.encode())
+    digest.update((inspect.getdoc(obj) or '').encode())
+    return digest.hexdigest()
+
+
+def _write_if_changed(path: str, content: str, encoding: str) -> bool:
+    if os.path.exists(path):
+        with open(path, encoding=encoding) as f:
+            if f.read() == content:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding=encoding) as f:
+        f.write(content)
+    return True
+
+
+def _match_stubs(filenames: List[str], entries: Dict[str, Any],
+                 suffix: str) -> Optional[Dict[str, Tuple[Any, str]]]:
+    """Return the entry and the object name of each stub, or None if a stub
+    matches no entry."""
+    stubs = {}
+    for filename in filenames:
+        stem = filename[:-len(suffix)]
+        if stem in entries:
+            stubs[filename] = (entries[stem], entries[stem].name)
+            continue
+        # the stub of a member of a recursive entry, which goes next to the
+        # stub of its parent
+        entry = next((e for key, e in entries.items()
+                      if stem.startswith(key + '.')), None)
+        if entry is None:
+            return None
+        stubs[filename] = (entry, stem)
+    return stubs
+
+
+def generate_stubs(app) -> None:
+    """Generate the changed autosummary stubs of the project."""
+    from sphinx.ext.autosummary.generate import (find_autosummary_in_files,
+                                                 generate_autosummary_docs)
+    from sphinx.util import logging
+
+    logger = logging.getLogger(__name__)
+    env = app.builder.env
+    config = app.config
+    suffix = next(iter(config.source_suffix))
+    encoding = config.source_encoding
+    stub_docnames: Set[str] = set()
+    written = 0
+
+    for docname in sorted(env.found_docs):
+        source = env.doc2path(docname)
+        with open(source, encoding=encoding) as f:
+            if 'autosummary::' not in f.read():
+                continue
+        entries = {
+            config.autosummary_filename_map.get(entry.name, entry.name):
+            entry
+            for entry in find_autosummary_in_files([source])
+            if entry.path is not None
+        }
+        if not entries:
+            continue
+        source_dir = os.path.dirname(source)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generate_autosummary_docs(
+                [source],
+                output_dir=tmp_dir,
+                suffix=suffix,
+                app=app,
+                imported_members=config.autosummary_imported_members,
+                encoding=encoding)
+            stubs = _match_stubs(sorted(os.listdir(tmp_dir)), entries, suffix)
+            for filename, (entry, name) in (stubs or {}).items():
+                with open(
+                        os.path.join(tmp_dir, filename),
+                        encoding=encoding) as f:
+                    content = f.read()
+                content = (f'{content.rstrip()}\n\n..\n  {HASH_MARKER} '
+                           f'{object_hash(name, content)}\n')
+                path = os.path.normpath(
+                    os.path.join(source_dir, entry.path, filename))
+                written += _write_if_changed(path, content, encoding)
+                stub_docnames.add(env.path2doc(path))
+        if stubs is None:
+            # where the unmatched stub goes and which object it documents
+            # are unknown, so autosummary generates the stubs of this
+            # document as it would without this extension
+            logger.info(f'[autosummary_cache] a stub of {docname} matches '
+                        'no entry, regenerating its stubs')
+            generate_autosummary_docs(
+                [source],
+                suffix=suffix,
+                app=app,
+                imported_members=config.autosummary_imported_members,
+                overwrite=True,
+                encoding=encoding)
+
+    app.env.autosummary_stub_docnames = stub_docnames
+    logger.info(f'[autosummary_cache] {written} of {len(stub_docnames)} '
+                'stubs changed')
+
+
+def drop_module_dependencies(app, doctree) -> None:
+    """Make a stub depend on its own modification time only.
+
+    autodoc makes the stub depend on the module file of its object, so that
+    it is re-read whenever any object of the module changes. The stub is
+    already rewritten when its own object changes.
+    """
+    docname = app.env.docname
+    if docname not in getattr(app.env, 'autosummary_stub_docnames', ()):
+        return
+    dependencies = app.env.dependencies.get(docname)
+    if dependencies:
+        dependencies.difference_update(
+            [dep for dep in dependencies if dep.endswith('.py')])
+
+
+def config_inited(app, config) -> None:
+    if config.autosummary_incremental:
+        # this extension generates the stubs instead of autosummary
+        config.autosummary_generate = False
+
+
+def builder_inited(app) -> None:
+    if app.config.autosummary_incremental:
+        generate_stubs(app)
+
+
+def setup(app):
+    app.setup_extension('sphinx.ext.autosummary')
+    app.add_config_value('autosummary_incremental', False, 'env')
+    app.connect('config-inited', config_inited)
+    app.connect('builder-inited', builder_inited)
+    # run after the dependency collector of Sphinx, which records the module
+    # files noted by autodoc
+    app.connect('doctree-read', drop_module_dependencies, priority=900)
+    return {'parallel_read_safe': True, 'parallel_write_safe': True}
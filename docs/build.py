@@ -0,0 +1,139 @@
+"""Build the documentation of every language concurrently.
+
+Each language is built by its own ``sphinx-build`` process, all of them at
+the same time, and each process uses Sphinx's parallel mode with a share of
+the CPUs. The outputs are the same as running ``make html`` in each
+language directory, i.e. ``docs/<language>/_build/<builder>``.
+
+The environment of each build is kept in ``docs/<language>/_build/doctrees``
+as ``make`` does, so a later build only re-reads, and re-runs autodoc for, the
+documents which changed since.
+
+After an HTML build, the prebuilt search index of the language is updated
+by :mod:`search_index`, in ``docs/<language>/_build/html/search.idx``.
+
+Examples:
+    Build the HTML documentation of every language::
+
+        $ python docs/build.py
+
+    Build the Chinese documentation only, from scratch::
+
+        $ python docs/build.py --languages zh_cn --fresh
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+import intersphinx_cache
+import search_index
+
+DOCS_DIR = os.path.dirname(os.path.abspath(__file__))
+LANGUAGES = ('en', 'zh_cn')
+
+
+def sphinx_command(language: str,
+                   builder: str = 'html',
+                   jobs: int = 1,
+                   fresh: bool = False) -> List[str]:
+    """Return the ``sphinx-build`` command building one language.
+
+    Args:
+        language (str): The language directory under ``docs``, such as
+            ``en``.
+        builder (str): The Sphinx builder. Defaults to ``html``.
+        jobs (int): The number of parallel Sphinx processes. Defaults to 1.
+        fresh (bool): Whether to ignore the saved environment and rebuild
+            every document. Defaults to False.
+
+    Returns:
+        list[str]: The command line.
+    """
+    source_dir = os.path.join(DOCS_DIR, language)
+    build_dir = os.path.join(source_dir, '_build')
+    command = [
+        sys.executable, '-m', 'sphinx', '-b', builder, '-d',
+        os.path.join(build_dir, 'doctrees'), '-j',
+        str(jobs)
+    ]
+    if fresh:
+        command.append('-E')
+    return command + [source_dir, os.path.join(build_dir, builder)]
+
+
+def build(languages: Sequence[str] = LANGUAGES,
+          builder: str = 'html',
+          jobs: Optional[int] = None,
+          fresh: bool = False) -> int:
+    """Build the documentation of several languages concurrently.
+
+    The output of each build is printed once it finishes, so that the logs
+    of the languages are not interleaved.
+
+    Args:
+        languages (Sequence[str]): The language directories under ``docs``.
+            Defaults to every language.
+        builder (str): The Sphinx builder. Defaults to ``html``.
+        jobs (int, optional): The number of parallel Sphinx processes of
+            each build. Defaults to None, which shares the CPUs evenly among
+            the languages.
+        fresh (bool): Whether to rebuild every document. Defaults to False.
+
+    Returns:
+        int: 0 if every build succeeded, else the number of failed builds.
+    """
+    if jobs is None:
+        jobs = max(1, (os.cpu_count() or 1) // len(languages))
+    # refresh the stale intersphinx inventories once, rather than in every
+    # build at the same time
+    intersphinx_cache.mapping()
+
+    def run(language):
+        start = time.perf_counter()
+        process = subprocess.run(
+            sphinx_command(language, builder, jobs, fresh),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True)
+        return process, time.perf_counter() - start
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=len(languages)) as pool:
+        for language, (process, seconds) in zip(languages,
+                                                pool.map(run, languages)):
+            print(process.stdout, end='')
+            status = 'failed' if process.returncode else 'succeeded'
+            print(f'{language}: {builder} build {status} in {seconds:.1f}s')
+            failures += bool(process.returncode)
+            if builder == 'html' and not process.returncode:
+                tokenized = search_index.build_search_index(language)
+                print(f'{language}: search index updated, {tokenized} '
+                      'changed documents')
+    return failures
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Build the documentation of every language.')
+    parser.add_argument(
+        '--languages', nargs='+', choices=LANGUAGES, default=LANGUAGES)
+    parser.add_argument('--builder', default='html')
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='parallel Sphinx processes per language, defaults to the '
+        'number of CPUs divided by the number of languages')
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='ignore the saved environments and rebuild every document')
+    args = parser.parse_args(args)
+    return build(args.languages, args.builder, args.jobs, args.fresh)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# Configuration shared by the Sphinx builds of every language.
+#
+# Each docs/<language>/conf.py imports everything from this file and then
+# overrides the options that depend on the language. For a full list of
+# options see the documentation:
+# https://www.sphinx-doc.org/en/master/usage/configuration.html
+
+# -- Path setup --------------------------------------------------------------
+
+import os
+import sys
+
+import intersphinx_cache
+import pytorch_sphinx_theme
+
+DOCS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(DOCS_DIR)
+
+sys.path.insert(0, ROOT_DIR)
+
+# -- Project information -----------------------------------------------------
+
+project = 'docs-example'
+copyright = '2021, docs-example contributors'
+author = 'docs-example contributors'
+
+version_file = os.path.join(ROOT_DIR, 'docs_example', 'version.py')
+with open(version_file) as f:
+    exec(compile(f.read(), version_file, 'exec'))
+__version__ = locals()['__version__']
+# The short X.Y version
+version = __version__
+# The full version, including alpha/beta/rc tags
+release = __version__
+
+# -- General configuration ---------------------------------------------------
+
+# Add any Sphinx extension module names here, as strings. They can be
+# extensions coming with Sphinx (named 'sphinx.ext.*') or your custom
+# ones.
+
+extensions = [
+    'sphinx.ext.autodoc',
+    'sphinx.ext.autosummary',
+    'sphinx.ext.intersphinx',
+    'sphinx.ext.napoleon',
+    'sphinx.ext.viewcode',
+    'sphinx.ext.autosectionlabel',
+    'sphinx_markdown_tables',
+    'myst_parser',
+    'sphinx_copybutton',
+    'sphinxcontrib.mermaid',
+    'autosummary_cache',
+]  # yapf: disable
+
+# Configuration for intersphinx, using the inventories cached on disk, see
+# intersphinx_cache.py
+intersphinx_mapping = intersphinx_cache.mapping()
+
+# Only rewrite the autosummary stubs whose object changed, see
+# autosummary_cache.py
+autosummary_incremental = True
+
+# Add any paths that contain templates here, relative to the directory of the
+# conf.py of each language.
+templates_path = ['_templates']
+
+# List of patterns, relative to source directory, that match files and
+# directories to ignore when looking for source files.
+# This pattern also affects html_static_path and html_extra_path.
+exclude_patterns = ['_build', 'Thumbs.db', '.DS_Store']
+
+# -- Options for HTML output -------------------------------------------------
+
+# The theme to use for HTML and HTML Help pages.  See the documentation for
+# a list of builtin themes.
+#
+html_theme = 'pytorch_sphinx_theme'
+html_theme_path = [pytorch_sphinx_theme.get_html_theme_path()]
+
+html_theme_options = {
+    'menu': [
+        {
+            'name': 'GitHub',
+            'url': 'https://github.com/zhouzaida/docs-example'
+        },
+    ],
+    # Specify the language of shared menu
+    'menu_lang':
+    'en',
+}
+
+# Add any paths that contain custom static files (such as style sheets) here,
+# relative to the directory of the conf.py of each language. They are copied
+# after the builtin static files, so a file named "default.css" will
+# overwrite the builtin "default.css".
+html_static_path = ['_static']
+html_css_files = ['css/readthedocs.css']
+
+# -- Extension configuration -------------------------------------------------
+# Ignore >>> when copying code
+copybutton_prompt_text = r'>>> |\.\.\. '
+copybutton_prompt_is_regexp = True
@@ -0,0 +1,217 @@
+"""On-disk cache of the intersphinx inventories of the docs.
+
+Instead of letting ``sphinx.ext.intersphinx`` download the ``objects.inv``
+of every mapped project on each clean build, the inventories are kept in a
+local cache directory and handed to Sphinx as local files, so a build with a
+fresh cache does not touch the network.
+
+The cache is refreshed when an inventory is older than its time to live. If
+the refresh fails, the stale inventory is used. On air-gapped hosts, set
+``DOCS_OFFLINE=1`` to never fetch from the network, and pre-seed the cache
+from a host with network access, or from a local mirror directory laid out
+as ``<mirror>/<name>/objects.inv``.
+
+Environment variables:
+    DOCS_INTERSPHINX_CACHE: The cache directory. Defaults to
+        ``docs/_intersphinx``.
+    DOCS_INTERSPHINX_TTL: The time to live of the inventories in seconds.
+        Defaults to one week.
+    DOCS_OFFLINE: If set to a non-empty value, never fetch inventories.
+
+Examples:
+    Pre-seed the cache from the network, or from a local mirror::
+
+        $ python docs/intersphinx_cache.py
+        $ python docs/intersphinx_cache.py --mirror /mnt/inventories
+"""
+import argparse
+import os
+import sys
+import time
+import urllib.request
+from typing import Dict, Optional, Sequence, Tuple
+
+DOCS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(DOCS_DIR, '_intersphinx')
+DEFAULT_TTL = 7 * 24 * 3600
+TIMEOUT = 10
+
+# name -> base URL of the documentation of the project
+INVENTORIES = {
+    'python': 'https://docs.python.org/3',
+    'numpy': 'https://numpy.org/doc/stable',
+    'torch': 'https://pytorch.org/docs/stable/',
+    'mmcv': 'https://mmcv.readthedocs.io/en/master/',
+}
+
+
+def cache_dir() -> str:
+    """str: The cache directory, from ``DOCS_INTERSPHINX_CACHE``."""
+    return os.environ.get('DOCS_INTERSPHINX_CACHE') or DEFAULT_CACHE_DIR
+
+
+def cache_ttl() -> float:
+    """float: The time to live in seconds, from ``DOCS_INTERSPHINX_TTL``."""
+    return float(os.environ.get('DOCS_INTERSPHINX_TTL') or DEFAULT_TTL)
+
+
+def is_offline() -> bool:
+    """bool: Whether fetching is disabled by ``DOCS_OFFLINE``."""
+    return bool(os.environ.get('DOCS_OFFLINE'))
+
+
+def inventory_path(name: str, directory: Optional[str] = None) -> str:
+    """Return the path of the cached inventory of a project.
+
+    Args:
+        name (str): The name of the project, such as ``python``.
+        directory (str, optional): The cache directory. Defaults to None,
+            which means :func:`cache_dir`.
+
+    Returns:
+        str: The path of its ``objects.inv``.
+    """
+    return os.path.join(directory or cache_dir(), name, 'objects.inv')
+
+
+def is_fresh(path: str, ttl: float) -> bool:
+    """bool: Whether ``path`` exists and is younger than ``ttl`` seconds."""
+    try:
+        return time.time() - os.path.getmtime(path) < ttl
+    except OSError:
+        return False
+
+
+def _replace(path: str, data: bytes) -> None:
+    # write to a temporary file first, so that a concurrent build never reads
+    # a partial inventory
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def fetch(name: str,
+          url: str,
+          directory: Optional[str] = None,
+          mirror: Optional[str] = None) -> str:
+    """Download the inventory of a project into the cache.
+
+    Args:
+        name (str): The name of the project, such as ``python``.
+        url (str): The base URL of its documentation.
+        directory (str, optional): The cache directory. Defaults to None,
+            which means :func:`cache_dir`.
+        mirror (str, optional): A local directory to copy
+            ``<mirror>/<name>/objects.inv`` from instead of downloading it.
+            Defaults to None.
+
+    Returns:
+        str: The path of the cached inventory.
+
+    Raises:
+        OSError: If the inventory can not be downloaded or copied.
+    """
+    path = inventory_path(name, directory)
+    if mirror is not None:
+        with open(os.path.join(mirror, name, 'objects.inv'), 'rb') as f:
+            data = f.read()
+    else:
+        with urllib.request.urlopen(
+                url.rstrip('/') + '/objects.inv', timeout=TIMEOUT) as r:
+            data = r.read()
+    _replace(path, data)
+    return path
+
+
+def mapping(
+    inventories: Optional[Dict[str, str]] = None,
+    directory: Optional[str] = None,
+    ttl: Optional[float] = None,
+    offline: Optional[bool] = None
+) -> Dict[str, Tuple[str, Optional[str]]]:
+    """Return an ``intersphinx_mapping`` pointing to the cached inventories.
+
+    Stale or missing inventories are fetched first unless offline. A
+    project whose inventory is neither cached nor fetchable is left out when
+    offline, and left to intersphinx to download otherwise.
+
+    Args:
+        inventories (dict, optional): Map each project name to the base URL
+            of its documentation. Defaults to None, which means
+            :data:`INVENTORIES`.
+        directory (str, optional): The cache directory. Defaults to None,
+            which means :func:`cache_dir`.
+        ttl (float, optional): The time to live in seconds. Defaults to
+            None, which means :func:`cache_ttl`.
+        offline (bool, optional): Whether to never fetch. Defaults to None,
+            which means :func:`is_offline`.
+
+    Returns:
+        dict: Map each project name to a pair of its base URL and the path
+        of its local inventory, or None to let intersphinx download it.
+    """
+    if inventories is None:
+        inventories = INVENTORIES
+    if ttl is None:
+        ttl = cache_ttl()
+    if offline is None:
+        offline = is_offline()
+
+    result = {}
+    for name, url in inventories.items():
+        path = inventory_path(name, directory)
+        if not offline and not is_fresh(path, ttl):
+            try:
+                fetch(name, url, directory)
+            except OSError as e:
+                print(f'intersphinx_cache: failed to refresh {name}: {e}',
+                      file=sys.stderr)
+        if os.path.exists(path):
+            result[name] = (url, path)
+        elif not offline:
+            result[name] = (url, None)
+    return result
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Pre-seed the cache of the intersphinx inventories.')
+    parser.add_argument(
+        '--cache-dir', help='the cache directory, defaults to '
+        '$DOCS_INTERSPHINX_CACHE or docs/_intersphinx')
+    parser.add_argument(
+        '--mirror',
+        help='copy <mirror>/<name>/objects.inv instead of downloading')
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='refresh the inventories even if they are fresh')
+    parser.add_argument(
+        'names', nargs='*', help='the projects to cache, defaults to all')
+    args = parser.parse_args(args)
+    unknown = set(args.names) - set(INVENTORIES)
+    if unknown:
+        parser.error(f'unknown projects {sorted(unknown)}, choose from '
+                     f'{list(INVENTORIES)}')
+
+    ttl = 0 if args.force else cache_ttl()
+    failures = 0
+    for name in args.names or INVENTORIES:
+        path = inventory_path(name, args.cache_dir)
+        if is_fresh(path, ttl):
+            print(f'{name}: fresh, {path}')
+            continue
+        try:
+            fetch(name, INVENTORIES[name], args.cache_dir, args.mirror)
+        except OSError as e:
+            failures += 1
+            print(f'{name}: failed, {e}')
+        else:
+            print(f'{name}: cached, {path}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
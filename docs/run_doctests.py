@@ -0,0 +1,283 @@
+"""Run the doctests of the package docstrings and of the Markdown docs.
+
+The examples are collected from the docstrings of every module of
+``docs_example`` and from the fenced code blocks containing ``>>>`` prompts
+of the MyST Markdown files of the docs. They are run on a pool of processes.
+
+The examples which pass are cached, keyed on a hash of the example and of
+the source files of the ``docs_example`` modules it depends on, i.e. the
+module defining it and the modules it imports, transitively. Importing a
+package depends on all of its modules. An example is skipped on the next
+run unless its key changed.
+
+Examples:
+    Run every doctest, then only those whose example or dependencies
+    changed::
+
+        $ python docs/run_doctests.py
+        $ python docs/run_doctests.py
+
+    Run the doctests of the style guide again, ignoring the cache::
+
+        $ python docs/run_doctests.py --no-cache style_guide
+"""
+import argparse
+import ast
+import doctest
+import glob
+import hashlib
+import importlib
+import json
+import os
+import pkgutil
+import re
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+DOCS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(DOCS_DIR)
+PACKAGE = 'docs_example'
+DEFAULT_CACHE = os.path.join(DOCS_DIR, '_build', 'doctest_cache.json')
+
+sys.path.insert(0, ROOT_DIR)
+
+_FENCE = re.compile(r'^(`{3,}|~{3,})')
+_IMPORT = re.compile(r'^\s*(?:>>>|\.\.\.)\s*(?:from|import)\s+([\w.]+)', re.M)
+
+
+class Example(NamedTuple):
+    """The doctest of one docstring or one Markdown code block.
+
+    Attributes:
+        name (str): The unique name of the doctest.
+        module (str): The module whose docstring it is, or '' for a code
+            block.
+        path (str): The file it comes from.
+        lineno (int): Its first line in ``path``, 0-based.
+        source (str): Its text.
+    """
+    name: str
+    module: str
+    path: str
+    lineno: int
+    source: str
+
+
+def package_modules() -> Dict[str, str]:
+    """Return the source file of every module of the package by name."""
+    package = importlib.import_module(PACKAGE)
+    modules = {PACKAGE: package.__file__}
+    for info in pkgutil.walk_packages(package.__path__, f'{PACKAGE}.'):
+        # __main__ modules run their program when imported
+        if info.name.rpartition('.')[2] == '__main__':
+            continue
+        spec = info.module_finder.find_spec(info.name)
+        if spec is not None and spec.origin is not None:
+            modules[info.name] = spec.origin
+    return modules
+
+
+def _imported_names(path: str, module: str) -> Set[str]:
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    is_package = os.path.basename(path) == '__init__.py'
+    package = module if is_package else module.rpartition('.')[0]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ''
+            if node.level:
+                parent = package.rsplit('.', node.level - 1)[0]
+                base = f'{parent}.{base}' if base else parent
+            names.add(base)
+            names.update(f'{base}.{alias.name}' for alias in node.names)
+    return names
+
+
+def dependency_graph(modules: Dict[str, str]) -> Dict[str, Set[str]]:
+    """Map each module of the package to the modules it depends on.
+
+    A module depends on the package modules it imports, and a package also
+    depends on all of its modules, since ``docs_example`` imports them
+    lazily by name.
+    """
+    graph = {}
+    for module, path in modules.items():
+        deps = _imported_names(path, module) & modules.keys()
+        if os.path.basename(path) == '__init__.py':
+            deps.update(name for name in modules
+                        if name.startswith(f'{module}.'))
+        graph[module] = deps
+    return graph
+
+
+def closure(roots: Iterable[str], graph: Dict[str, Set[str]]) -> Set[str]:
+    """Return ``roots`` and every module they depend on, transitively."""
+    seen: Set[str] = set()
+    stack = [root for root in roots if root in graph]
+    while stack:
+        module = stack.pop()
+        if module not in seen:
+            seen.add(module)
+            stack.extend(graph[module] - seen)
+    return seen
+
+
+def collect_docstrings(modules: Dict[str, str]) -> List[Example]:
+    """Return the doctests of the docstrings of the package modules."""
+    finder = doctest.DocTestFinder()
+    examples = []
+    for module in modules:
+        for test in finder.find(importlib.import_module(module)):
+            if test.examples:
+                examples.append(
+                    Example(test.name, module, test.filename or '',
+                            test.lineno or 0, test.docstring or ''))
+    return examples
+
+
+def collect_markdown(paths: Iterable[str]) -> List[Example]:
+    """Return the code blocks with ``>>>`` prompts of Markdown files."""
+    examples = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            lines = f.readlines()
+        fence, start = None, 0
+        for lineno, line in enumerate(lines):
+            match = _FENCE.match(line.strip())
+            if fence is None and match:
+                fence, start = match.group(1), lineno + 1
+            elif fence is not None and line.strip() == fence:
+                source = ''.join(lines[start:lineno])
+                if '>>>' in source:
+                    name = f'{os.path.relpath(path, ROOT_DIR)}:{start + 1}'
+                    examples.append(Example(name, '', path, start, source))
+                fence = None
+    return examples
+
+
+def example_key(example: Example, modules: Dict[str, str],
+                graph: Dict[str, Set[str]],
+                file_hashes: Dict[str, str]) -> str:
+    """Return the cache key of an example.
+
+    It is the hash of the Python version, of the example, and of the source
+    files of the modules it depends on.
+    """
+    roots = {example.module} if example.module else set()
+    for name in _IMPORT.findall(example.source):
+        while name and name not in modules:
+            name = name.rpartition('.')[0]
+        roots.add(name)
+    digest = hashlib.sha256(sys.version.encode())
+    digest.update(example.name.encode())
+    digest.update(example.source.encode())
+    for module in sorted(closure(roots, graph)):
+        digest.update(file_hashes[modules[module]].encode())
+    return digest.hexdigest()
+
+
+def _file_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def run_example(example: Example) -> tuple:
+    """Run one example in a fresh namespace.
+
+    Returns:
+        tuple: The name of the example, its numbers of failed and attempted
+        examples, and the failure report.
+    """
+    if example.module:
+        globs = vars(importlib.import_module(example.module)).copy()
+    else:
+        globs = {'__name__': '__main__'}
+    test = doctest.DocTestParser().get_doctest(example.source, globs,
+                                               example.name, example.path,
+                                               example.lineno)
+    report: List[str] = []
+    runner = doctest.DocTestRunner(verbose=False)
+    try:
+        runner.run(test, out=report.append)
+    finally:
+        test.globs.clear()
+    return example.name, runner.failures, runner.tries, ''.join(report)
+
+
+def load_cache(path: str) -> Dict[str, str]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path: str, cache: Dict[str, str]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Run the doctests of the package and of the docs.')
+    parser.add_argument(
+        'patterns',
+        nargs='*',
+        help='only run the doctests whose name contains one of them')
+    parser.add_argument(
+        '--jobs', type=int, help='worker processes, defaults to the CPUs')
+    parser.add_argument('--cache', default=DEFAULT_CACHE)
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='run the doctests even if they passed before')
+    args = parser.parse_args(args)
+
+    modules = package_modules()
+    graph = dependency_graph(modules)
+    file_hashes = {path: _file_hash(path) for path in modules.values()}
+    markdown = sorted(glob.glob(os.path.join(DOCS_DIR, '*', '**', '*.md'),
+                                recursive=True))
+    examples = collect_docstrings(modules) + collect_markdown(markdown)
+    if args.patterns:
+        examples = [
+            e for e in examples if any(p in e.name for p in args.patterns)
+        ]
+
+    cache = {} if args.no_cache else load_cache(args.cache)
+    keys = {
+        e.name: example_key(e, modules, graph, file_hashes)
+        for e in examples
+    }
+    todo = [e for e in examples if cache.get(e.name) != keys[e.name]]
+
+    # imported here since concurrent.futures is slow to import
+    from concurrent.futures import ProcessPoolExecutor
+    failures = 0
+    attempts = 0
+    if todo:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            for name, failed, attempted, report in pool.map(
+                    run_example, todo, chunksize=4):
+                attempts += attempted
+                if failed:
+                    failures += 1
+                    print(report, end='')
+                    cache.pop(name, None)
+                else:
+                    cache[name] = keys[name]
+    save_cache(args.cache, cache)
+    print(f'{len(examples)} doctests: {len(examples) - len(todo)} cached, '
+          f'{len(todo) - failures} passed ({attempts} examples), '
+          f'{failures} failed')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
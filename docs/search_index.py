@@ -0,0 +1,225 @@
+"""Build the prebuilt search index of the docs of every language.
+
+The index, written by :func:`docs_example.search.build_index`, covers the
+pages of the docs and every object of the API reference, with the parsed
+docstring of the object from :mod:`docs_example.docindex`. It is written to
+``docs/<language>/_build/html/search.idx``, next to the HTML output, and is
+updated incrementally: only the pages and objects whose text changed are
+tokenized again.
+
+Examples:
+    Build the index of every language, then query it::
+
+        $ python docs/search_index.py
+        $ python docs/search_index.py --languages zh_cn --query 如何
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+DOCS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DOCS_DIR))
+
+from docs_example import docindex  # noqa: E402
+from docs_example.search import Document, SearchIndex, build_index  # noqa
+
+LANGUAGES = ('en', 'zh_cn')
+SKIPPED_DIRS = ('_build', '_static', '_templates', '__pycache__')
+
+_DIRECTIVE = re.compile(
+    r'^\.\. (currentmodule|automodule|autofunction|autoclass)::\s*(\S+)',
+    re.MULTILINE)
+_AUTOSUMMARY = re.compile(r'^\.\. autosummary::\n((?:[ \t]+.*\n|\n)+)',
+                          re.MULTILINE)
+_RST_TITLE = re.compile(r'^(\S.*)\n[=\-~^"#*]{3,}\s*$', re.MULTILINE)
+_MD_TITLE = re.compile(r'^#+\s+(.+)$', re.MULTILINE)
+_MARKUP = re.compile(r'<[^>]+>|[`*#=|]+|:\w+:')
+
+
+def index_path(language: str) -> str:
+    """Return the path of the search index of one language."""
+    return os.path.join(DOCS_DIR, language, '_build', 'html', 'search.idx')
+
+
+def _plain(text: str) -> str:
+    return _MARKUP.sub(' ', text)
+
+
+def _page_title(text: str, default: str) -> str:
+    match = _MD_TITLE.search(text) or _RST_TITLE.search(text)
+    return ' '.join(_plain(match.group(1)).split()) if match else default
+
+
+def page_documents(language: str) -> List[Document]:
+    """Return the documents of the pages of one language.
+
+    Args:
+        language (str): The language directory under ``docs``, such as
+            ``en``.
+
+    Returns:
+        list[Document]: A document per ``.rst`` and ``.md`` page.
+    """
+    source_dir = os.path.join(DOCS_DIR, language)
+    documents = []
+    for dirpath, dirnames, filenames in os.walk(source_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIPPED_DIRS)
+        for filename in sorted(filenames):
+            page, ext = os.path.splitext(filename)
+            if ext not in ('.rst', '.md'):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            name = os.path.relpath(os.path.join(dirpath, page), source_dir)
+            name = name.replace(os.sep, '/')
+            documents.append(
+                Document(f'page:{name}', _page_title(text, name),
+                         f'{name}.html', _plain(text)))
+    return documents
+
+
+def _docstring_text(doc: docindex.Docstring) -> str:
+    parts = [doc.summary, doc.description]
+    for section in doc.sections.values():
+        if isinstance(section, str):
+            parts.append(section)
+        else:
+            parts.extend(' '.join(field) for field in section)
+    return _plain('\n'.join(parts))
+
+
+def _resolve(names: Sequence[str], name: str) -> Optional[str]:
+    # the name under which docindex stores an object, which is a submodule
+    # of the package re-exporting it
+    if name in names:
+        return name
+    package, _, attr = name.rpartition('.')
+    matches = [
+        key for key in names
+        if key.startswith(f'{package}.') and key.endswith(f'.{attr}')
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
+def documented_objects(language: str) -> Dict[str, str]:
+    """Return the objects of the API reference of one language.
+
+    The objects are read from the ``autofunction``, ``autoclass`` and
+    ``autosummary`` directives of ``api/*.rst``, and the members of the
+    classes are included.
+
+    Args:
+        language (str): The language directory under ``docs``.
+
+    Returns:
+        dict[str, str]: The URL of the documentation of each object, by its
+        documented name.
+    """
+    api_dir = os.path.join(DOCS_DIR, language, 'api')
+    index = docindex.get_index()
+    names = index.names()
+    objects = {}
+    for filename in sorted(os.listdir(api_dir)):
+        page, ext = os.path.splitext(filename)
+        if ext != '.rst':
+            continue
+        with open(os.path.join(api_dir, filename), encoding='utf-8') as f:
+            text = f.read()
+        module = ''
+        documented = []
+        for directive, target in _DIRECTIVE.findall(text):
+            if directive in ('currentmodule', 'automodule'):
+                module = target
+            else:
+                documented.append((f'{module}.{target}',
+                                   f'api/{page}.html'))
+        for block in _AUTOSUMMARY.findall(text):
+            for line in block.splitlines():
+                line = line.strip()
+                if line and not line.startswith(':'):
+                    name = f'{module}.{line}'
+                    documented.append((name, f'api/generated/{name}.html'))
+        for name, url in documented:
+            objects[name] = f'{url}#{name}'
+            key = _resolve(names, name)
+            if key is None:
+                continue
+            for member in names:
+                if member.startswith(f'{key}.'):
+                    member_name = name + member[len(key):]
+                    objects[member_name] = f'{url}#{member_name}'
+    return objects
+
+
+def api_documents(language: str) -> List[Document]:
+    """Return the documents of the objects of the API reference.
+
+    Args:
+        language (str): The language directory under ``docs``.
+
+    Returns:
+        list[Document]: A document per object, whose text is its parsed
+        docstring.
+    """
+    index = docindex.get_index()
+    documents = []
+    for name, url in sorted(documented_objects(language).items()):
+        try:
+            text = _docstring_text(index.lookup(name))
+        except KeyError:
+            text = ''
+        # the name is also indexed without its package, so that queries
+        # such as ``GreetingEngine.say`` match it
+        short_name = name.replace('docs_example.', '')
+        documents.append(
+            Document(f'api:{name}', name, url, f'{short_name}\n{text}'))
+    return documents
+
+
+def build_search_index(language: str, path: Optional[str] = None) -> int:
+    """Build or update the search index of one language.
+
+    Args:
+        language (str): The language directory under ``docs``.
+        path (str, optional): The path of the index. Defaults to None, which
+            means :func:`index_path`.
+
+    Returns:
+        int: The number of pages and objects tokenized again.
+    """
+    documents = page_documents(language) + api_documents(language)
+    return build_index(path or index_path(language), documents)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Build the search index of every language.')
+    parser.add_argument(
+        '--languages', nargs='+', choices=LANGUAGES, default=LANGUAGES)
+    parser.add_argument(
+        '--query', help='search the built index and print the hits')
+    args = parser.parse_args(args)
+    for language in args.languages:
+        start = time.perf_counter()
+        tokenized = build_search_index(language)
+        seconds = time.perf_counter() - start
+        print(f'{language}: indexed {tokenized} changed documents in '
+              f'{seconds * 1000:.1f}ms')
+        if args.query is None:
+            continue
+        with SearchIndex(index_path(language)) as index:
+            start = time.perf_counter()
+            hits = index.search(args.query)
+            seconds = time.perf_counter() - start
+            for hit in hits:
+                print(f'  {hit.score:6.2f} {hit.title} ({hit.url})')
+            print(f'  {len(hits)} hits in {seconds * 1e6:.0f}us')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,54 @@
-from .example1 import hello
-from .example2 import hi
-from .style_guide import ExampleClass, example_generator, module_level_function
+import importlib
+import os
 
 __all__ = [
-    'hello', 'hi', 'module_level_function', 'example_generator', 'ExampleClass'
+    'hello', 'hi', 'module_level_function', 'module_level_function_batch',
+    'example_generator', 'example_generator_batched', 'ExampleSequence',
+    'ExampleClass', 'SlottedExampleClass', 'ExampleClassArray'
 ]
+
+# The submodules are imported on first attribute access (PEP 562), so that
+# ``import docs_example`` stays cheap for callers that only need one of them.
+# Map each public name to the module defining it and the attribute to take
+# from that module, or None if the name is the module itself.
+_LAZY_ATTRS = {
+    'hello': ('.example1.hello', None),
+    'hi': ('.example2.hi', None),
+    'module_level_function': ('.style_guide', 'module_level_function'),
+    'module_level_function_batch':
+    ('.style_guide', 'module_level_function_batch'),
+    'example_generator': ('.style_guide', 'example_generator'),
+    'example_generator_batched': ('.style_guide', 'example_generator_batched'),
+    'ExampleSequence': ('.style_guide', 'ExampleSequence'),
+    'ExampleClass': ('.style_guide', 'ExampleClass'),
+    'SlottedExampleClass': ('.style_guide', 'SlottedExampleClass'),
+    'ExampleClassArray': ('.style_guide', 'ExampleClassArray'),
+}
+# submodules which are imported on first attribute access as well, e.g.
+# ``docs_example.style_guide`` after ``import docs_example``
+_SUBMODULES = ('cli', 'docindex', 'example1', 'example2', 'greeting',
+               'instrument', 'search', 'style_guide', 'version')
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        # importing a submodule sets it as an attribute of the package
+        return importlib.import_module(f'.{name}', __name__)
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    # cache the value so that __getattr__ is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(__all__) | set(_SUBMODULES))
+
+
+if os.environ.get('DOCS_EXAMPLE_INSTRUMENT'):
+    importlib.import_module('.instrument', __name__).enable()
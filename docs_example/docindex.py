@@ -0,0 +1,477 @@
+"""Parser of Google style docstrings and persistent index of the API.
+
+The parser understands the conventions of
+:mod:`docs_example.style_guide.docstring`: a summary, a description and the
+``Args``, ``Returns``, ``Yields``, ``Raises``, ``Attributes``, ``Note``,
+``Warning`` and ``Examples`` sections. It is a few regular expressions over
+the lines of the docstring, much faster than parsing with Sphinx.
+
+The index maps every public function, class and method of ``docs_example``
+to its parsed docstring. It reads the source files with :mod:`ast` rather
+than importing them, and is saved to disk, keyed by the modification time,
+size and hash of each module, so that loading it takes milliseconds and only
+the modules changed since are parsed again. A refresh that parsed a module
+saves the file again if its cache directory is writable, otherwise the index
+is only kept in memory.
+
+Examples:
+    >>> from docs_example import docindex
+    >>> doc = docindex.lookup('docs_example.style_guide.module_level_function')
+    >>> doc.summary
+    'This is an example of a module level function.'
+    >>> [arg.name for arg in doc.sections['Args']]
+    ['param1', 'param2', '*args', '**kwargs']
+    >>> doc.sections['Returns'][0].type
+    'bool'
+"""
+from __future__ import annotations
+
+import marshal
+import os
+import threading
+from collections import namedtuple
+
+INDEX_VERSION = 2
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# section heading -> canonical section name
+SECTIONS = {
+    'Args': 'Args',
+    'Arguments': 'Args',
+    'Parameters': 'Args',
+    'Attributes': 'Attributes',
+    'Returns': 'Returns',
+    'Return': 'Returns',
+    'Yields': 'Yields',
+    'Yield': 'Yields',
+    'Raises': 'Raises',
+    'Note': 'Note',
+    'Notes': 'Note',
+    'Warning': 'Warning',
+    'Warnings': 'Warning',
+    'Example': 'Examples',
+    'Examples': 'Examples',
+    'Todo': 'Todo',
+}
+# sections made of fields, the others are kept as text
+FIELD_SECTIONS = ('Args', 'Attributes', 'Raises')
+# sections made of one field whose name is empty
+RETURN_SECTIONS = ('Returns', 'Yields')
+
+Field = namedtuple('Field', ['name', 'type', 'description'])
+Field.__doc__ = """A documented argument, attribute, return value or exception.
+
+``type`` is '' if it is not given, and ``name`` is '' for a return value.
+For an exception, ``name`` is the exception class.
+"""
+
+Docstring = namedtuple('Docstring', ['summary', 'description', 'sections'])
+Docstring.__doc__ = """A parsed docstring.
+
+``sections`` maps each canonical section name, such as ``Args``, to a list of
+:class:`Field` for the ``Args``, ``Attributes``, ``Raises``, ``Returns`` and
+``Yields`` sections, or to its text for the others. The fields or texts of
+a section that appears more than once are merged.
+"""
+
+# the patterns are compiled on first use by the cache of re, so that loading
+# the index does not import re
+_HEADING = r'^(\w+):\s*$'
+_ARG = r'^(\*{0,2}\w+)\s*(?:\((.*?)\))?\s*:\s*(.*)$'
+_RAISE = r'^([\w.]+)\s*:\s*(.*)$'
+_RETURN = r'^([^:\s][^:]*?)\s*:\s+(.*)$'
+
+
+def _join(lines: list) -> str:
+    return ' '.join(line.strip() for line in lines if line.strip())
+
+
+def _parse_fields(section: str, lines: list) -> list:
+    import re
+
+    if section in RETURN_SECTIONS:
+        match = re.match(_RETURN, lines[0].strip()) if lines else None
+        if match is None:
+            return [Field('', '', _join(lines))]
+        return [Field('', match.group(1), _join([match.group(2)] + lines[1:]))]
+
+    fields = []
+    for line in lines:
+        if not line.strip():
+            continue
+        if line[0].isspace() and fields:
+            # a continuation of the description of the previous field
+            name, type_, description = fields[-1]
+            fields[-1] = Field(name, type_, _join([description, line]))
+            continue
+        if section == 'Raises':
+            match = re.match(_RAISE, line)
+            if match is not None:
+                fields.append(Field(match.group(1), '', match.group(2)))
+                continue
+        else:
+            match = re.match(_ARG, line)
+            if match is not None:
+                fields.append(
+                    Field(match.group(1), match.group(2) or '',
+                          match.group(3)))
+                continue
+        fields.append(Field('', '', line.strip()))
+    return fields
+
+
+def parse(docstring: str) -> Docstring:
+    """Parse a Google style docstring.
+
+    Examples:
+        >>> doc = parse('''Add two numbers.
+        ...
+        ...     Args:
+        ...         a (int): The first number.
+        ...         b (int, optional): The second number. Defaults to
+        ...             1.
+        ...
+        ...     Returns:
+        ...         int: The sum.
+        ...     ''')
+        >>> doc.summary
+        'Add two numbers.'
+        >>> arg = doc.sections['Args'][1]
+        >>> arg.name, arg.type, arg.description
+        ('b', 'int, optional', 'The second number. Defaults to 1.')
+
+    Args:
+        docstring (str, optional): The docstring, as in ``__doc__``.
+
+    Returns:
+        Docstring: The summary, the description and the sections.
+    """
+    # imported here since they are slow to import, and only needed when a
+    # module changed
+    import inspect
+    import re
+    import textwrap
+
+    lines = inspect.cleandoc(docstring or '').splitlines()
+    end = next((i for i, line in enumerate(lines) if not line.strip()),
+               len(lines))
+    summary = _join(lines[:end])
+
+    description: list = []
+    sections = {}
+    i = end
+    while i < len(lines):
+        line = lines[i]
+        match = re.match(_HEADING, line)
+        if match is None or match.group(1) not in SECTIONS:
+            description.append(line)
+            i += 1
+            continue
+        # the body of a section is the following blank or indented lines
+        start = i = i + 1
+        while i < len(lines) and (not lines[i].strip()
+                                  or lines[i][0].isspace()):
+            i += 1
+        body = textwrap.dedent('\n'.join(lines[start:i])).strip('\n')
+        name = SECTIONS[match.group(1)]
+        # a repeated section, such as a second Note, is merged into the
+        # first one
+        if name in FIELD_SECTIONS or name in RETURN_SECTIONS:
+            fields = _parse_fields(name, body.splitlines())
+            sections[name] = sections.get(name, []) + fields
+        elif name in sections:
+            sections[name] = f'{sections[name]}\n\n{body}'
+        else:
+            sections[name] = body
+    return Docstring(summary, '\n'.join(description).strip('\n'), sections)
+
+
+def parse_source(source: str, module: str) -> dict:
+    """Parse the docstrings of the public objects of a module source.
+
+    Args:
+        source (str): The source code of the module.
+        module (str): The name of the module, such as
+            ``docs_example.style_guide.docstring``.
+
+    Returns:
+        dict: Map the fully qualified name of the module and of each of its
+        public functions, classes and methods to its parsed docstring.
+    """
+    # imported here since ast is slow to import, and only needed when a
+    # module changed
+    import ast
+
+    tree = ast.parse(source)
+    objects = {module: parse(ast.get_docstring(tree, clean=False))}
+
+    def visit(node, prefix: str) -> None:
+        for child in node.body:
+            if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef,
+                                      ast.ClassDef)):
+                continue
+            if child.name.startswith('_'):
+                continue
+            name = f'{prefix}.{child.name}'
+            objects[name] = parse(ast.get_docstring(child, clean=False))
+            if isinstance(child, ast.ClassDef):
+                visit(child, name)
+
+    visit(tree, module)
+    return objects
+
+
+def _to_plain(doc: Docstring) -> tuple:
+    sections = {
+        name: value if isinstance(value, str) else [tuple(f) for f in value]
+        for name, value in doc.sections.items()
+    }
+    return (doc.summary, doc.description, sections)
+
+
+def _to_docstring(plain: tuple) -> Docstring:
+    summary, description, sections = plain
+    return Docstring(
+        summary, description, {
+            name:
+            value if isinstance(value, str) else [Field(*f) for f in value]
+            for name, value in sections.items()
+        })
+
+
+def _module_name(path: str, package_dir: str) -> str:
+    relpath = os.path.relpath(path, os.path.dirname(package_dir))
+    parts = relpath[:-len('.py')].split(os.sep)
+    if parts[-1] == '__init__':
+        parts.pop()
+    return '.'.join(parts)
+
+
+def default_path() -> str:
+    """str: The path of the index file.
+
+    It is ``docs_example/docindex.marshal`` in ``$XDG_CACHE_HOME``, or in
+    ``~/.cache`` if it is not set.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'docs_example', 'docindex.marshal')
+
+
+class DocIndex:
+    """A persistent index of the parsed docstrings of ``docs_example``.
+
+    Each module is stored with the modification time, size and hash of its
+    source file. On :meth:`refresh`, a module whose modification time and
+    size are unchanged is trusted without reading it, and one whose hash is
+    unchanged is not parsed again.
+
+    Examples:
+        >>> index = DocIndex()
+        >>> doc = index.lookup('docs_example.greeting.GreetingEngine.say')
+        >>> doc.sections['Args'][0].name
+        'word'
+
+    Args:
+        path (str, optional): The path of the index file. Defaults to None,
+            which means :func:`default_path`.
+        package_dir (str, optional): The directory of the package to index.
+            Defaults to None, which means the one of ``docs_example``.
+    """
+
+    def __init__(self,
+                 path: str | None = None,
+                 package_dir: str | None = None):
+        self.path = path or default_path()
+        self.package_dir = package_dir or PACKAGE_DIR
+        self._lock = threading.Lock()
+        # module name -> (mtime_ns, size, sha256, {name: Docstring})
+        self._modules: dict = {}
+        self._objects: dict = {}
+        self._fresh = False
+
+    def load(self) -> None:
+        """Load the index file, if it exists and has the current format.
+
+        The file is written with :mod:`marshal`, which is faster to load than
+        :mod:`pickle` and needs no import, so the named tuples are stored as
+        plain tuples.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                version, modules = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if version != INDEX_VERSION:
+            return
+        self._modules = {
+            name: (mtime_ns, size, digest, {
+                key: _to_docstring(doc)
+                for key, doc in objects.items()
+            })
+            for name, (mtime_ns, size, digest, objects) in modules.items()
+        }
+
+    def save(self) -> None:
+        """Write the index file atomically."""
+        modules = {
+            name: (mtime_ns, size, digest, {
+                key: _to_plain(doc)
+                for key, doc in objects.items()
+            })
+            for name, (mtime_ns, size, digest,
+                       objects) in self._modules.items()
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((INDEX_VERSION, modules), f)
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, save: bool = True) -> int:
+        """Parse the modules changed since the index was saved.
+
+        The index file is loaded first if needed. If any module changed, the
+        index is saved again, unless the directory of the index file, or the
+        cache directory containing it, is not writable.
+
+        Args:
+            save (bool): Whether to save the index if a module changed.
+                Defaults to True.
+
+        Returns:
+            int: The number of modules parsed again.
+        """
+        with self._lock:
+            if not self._modules:
+                self.load()
+            modules = {}
+            parsed = 0
+            changed = False
+            for dirpath, dirnames, filenames in os.walk(self.package_dir):
+                dirnames[:] = [d for d in dirnames if d != '__pycache__']
+                for filename in filenames:
+                    if not filename.endswith('.py'):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    name = _module_name(path, self.package_dir)
+                    old_entry = self._modules.get(name)
+                    entry = self._refresh_module(path, name, old_entry)
+                    if entry is not old_entry:
+                        changed = True
+                        parsed += old_entry is None or entry[3] is not \
+                            old_entry[3]
+                    modules[name] = entry
+            changed = changed or modules.keys() != self._modules.keys()
+            self._modules = modules
+            self._objects = {
+                name: doc
+                for entry in modules.values()
+                for name, doc in entry[3].items()
+            }
+            self._fresh = True
+            if changed and save and self._writable():
+                try:
+                    self.save()
+                except OSError:
+                    # a full disk only costs parsing on the next start
+                    pass
+            return parsed
+
+    def _writable(self) -> bool:
+        # the directory of the index file, or its parent, such as ~/.cache,
+        # if it is not created yet
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            directory = os.path.dirname(directory)
+        return os.access(directory, os.W_OK)
+
+    def _refresh_module(self, path: str, name: str, entry: tuple) -> tuple:
+        stat = os.stat(path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns,
+                                               stat.st_size):
+            return entry
+        with open(path, 'rb') as f:
+            source = f.read()
+        # imported here since hashlib is slow to import, and only needed
+        # when a module was touched
+        import hashlib
+
+        digest = hashlib.sha256(source).hexdigest()
+        if entry is not None and entry[2] == digest:
+            objects = entry[3]
+        else:
+            objects = parse_source(source.decode('utf-8'), name)
+        return (stat.st_mtime_ns, stat.st_size, digest, objects)
+
+    def lookup(self, name: str) -> Docstring:
+        """Return the parsed docstring of a public object.
+
+        Names re-exported by a package, such as
+        ``docs_example.style_guide.ExampleClass``, are resolved to the
+        object of the same name defined in one of its submodules, if there
+        is exactly one.
+
+        Args:
+            name (str): The fully qualified name of the object.
+
+        Returns:
+            Docstring: Its parsed docstring.
+
+        Raises:
+            KeyError: If no public object has this name.
+        """
+        if not self._fresh:
+            self.refresh()
+        doc = self._objects.get(name)
+        if doc is not None:
+            return doc
+        package, _, attr = name.rpartition('.')
+        while package:
+            matches = [
+                doc for key, doc in self._objects.items()
+                if key.startswith(f'{package}.') and key.endswith(f'.{attr}')
+            ]
+            if len(matches) == 1:
+                return matches[0]
+            package, _, head = package.rpartition('.')
+            attr = f'{head}.{attr}'
+        raise KeyError(name)
+
+    def names(self) -> list:
+        """list[str]: The sorted names of the indexed objects."""
+        if not self._fresh:
+            self.refresh()
+        return sorted(self._objects)
+
+
+_default_index = None
+
+
+def get_index() -> DocIndex:
+    """DocIndex: The shared index of ``docs_example``, refreshed once."""
+    global _default_index
+    if _default_index is None:
+        _default_index = DocIndex()
+    return _default_index
+
+
+def lookup(name: str) -> Docstring:
+    """Return :meth:`DocIndex.lookup` of the shared index."""
+    return get_index().lookup(name)
+
+
+def docstring_of(obj) -> Docstring:
+    """Return the parsed docstring of a public object of ``docs_example``.
+
+    It is looked up in the shared index by the ``__module__`` and
+    ``__qualname__`` of ``obj``, so that the object does not need to be
+    parsed again.
+
+    Args:
+        obj: A function, class or method of ``docs_example``.
+
+    Returns:
+        Docstring: Its parsed docstring.
+    """
+    return lookup(f'{obj.__module__}.{obj.__qualname__}')
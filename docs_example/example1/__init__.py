@@ -1,3 +1,6 @@
-from .hello import say_hello
+from .hello import (say_hello, say_hello_async, say_hello_bulk,
+                    say_hello_concurrent)
 
-__all__ = ['say_hello']
+__all__ = [
+    'say_hello', 'say_hello_bulk', 'say_hello_async', 'say_hello_concurrent'
+]
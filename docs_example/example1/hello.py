@@ -1,8 +1,104 @@
+import sys
+
+from ..greeting.engine import default_engine
+from ..greeting.stream import (DEFAULT_BATCH_SIZE, DEFAULT_BUFFER_SIZE,
+                               write_lines, write_lines_async)
+from ..greeting.writer import get_default_writer
+
+
 def say_hello(n: int = 1):
     """Print hello n times to terminal.
 
+    The rendered output is cached by the shared greeting engine, so repeated
+    calls with the same ``n`` cost a single write per 64 KiB.
+
     Args:
         n (int): Print hello ``n`` times to terminal.
     """
-    for _ in range(n):
-        print('hello')
+    default_engine.say('hello', n)
+
+
+def say_hello_bulk(n: int = 1,
+                   file=None,
+                   buffer_size: int = DEFAULT_BUFFER_SIZE):
+    """Write hello n times to a stream in large chunks.
+
+    The output is byte-identical to :func:`say_hello`, but it is never
+    rendered as a whole. The lines are packed into chunks of at most
+    ``buffer_size`` bytes, so the number of writes is ``O(n / chunk)`` and
+    memory stays bounded for any ``n``.
+
+    Args:
+        n (int): Write hello ``n`` times.
+        file (IO | int, optional): A writable text stream, binary stream or
+            file descriptor. Defaults to None, which means ``sys.stdout``.
+        buffer_size (int): Upper bound of the size of each chunk in bytes.
+            A chunk always holds at least one line. Defaults to 65536.
+
+    Examples:
+        >>> say_hello_bulk(2)
+        hello
+        hello
+    """
+    write_lines('hello', n, file, buffer_size)
+
+
+async def say_hello_async(n: int = 1,
+                          writer=None,
+                          batch_size: int = DEFAULT_BATCH_SIZE):
+    """Write hello n times to an async sink without blocking the event loop.
+
+    The lines are written in batches, and the sink is drained between
+    batches so a slow consumer applies backpressure. Cancelling the task
+    stops the stream within one batch.
+
+    Args:
+        n (int): Write hello ``n`` times.
+        writer: An :class:`asyncio.StreamWriter` or any object with a
+            ``write(data: bytes)`` method, which may return an awaitable.
+            Defaults to None, which means ``sys.stdout.buffer``.
+        batch_size (int): Upper bound of the size of each batch in bytes.
+            Defaults to 65536.
+
+    Examples:
+        >>> import asyncio
+        >>> import io
+        >>> sink = io.BytesIO()
+        >>> asyncio.run(say_hello_async(2, sink))
+        >>> sink.getvalue()
+        b'hello\\nhello\\n'
+    """
+    if writer is None:
+        sys.stdout.flush()
+        await write_lines_async('hello', n, sys.stdout.buffer, batch_size)
+        sys.stdout.buffer.flush()
+    else:
+        await write_lines_async('hello', n, writer, batch_size)
+
+
+def say_hello_concurrent(n: int = 1, writer=None):
+    """Print hello n times, safely from any number of threads at once.
+
+    The output is rendered in the calling thread and committed to a
+    :class:`~docs_example.greeting.CoalescingWriter`, whose background thread
+    coalesces the output of all threads into large writes. The output of one
+    call is never interleaved with the output of other calls, and threads do
+    not contend for the lock of stdout. The call returns before the output is
+    written.
+
+    Args:
+        n (int): Print hello ``n`` times.
+        writer (CoalescingWriter, optional): The writer to commit to.
+            Defaults to None, which means the writer to ``sys.stdout`` shared
+            by every thread, which writes everything before exit.
+
+    Examples:
+        >>> from docs_example.greeting import CoalescingWriter
+        >>> with CoalescingWriter() as writer:
+        ...     say_hello_concurrent(2, writer)
+        hello
+        hello
+    """
+    if writer is None:
+        writer = get_default_writer()
+    writer.say('hello', n)
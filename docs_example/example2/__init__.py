@@ -1,3 +1,3 @@
-from .hi import say_hi
+from .hi import say_hi, say_hi_async, say_hi_concurrent, say_hi_zero_copy
 
-__all__ = ['say_hi']
+__all__ = ['say_hi', 'say_hi_zero_copy', 'say_hi_async', 'say_hi_concurrent']
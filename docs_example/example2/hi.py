@@ -1,8 +1,214 @@
+import errno
+import mmap
+import os
+import sys
+
+from ..greeting.engine import default_engine
+from ..greeting.stream import DEFAULT_BATCH_SIZE, write_lines_async
+from ..greeting.writer import get_default_writer
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+# errors raised by ``os.sendfile`` when the pair of file descriptors is not
+# supported, in which case we fall back to ``os.writev``
+_SENDFILE_UNSUPPORTED = {
+    errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP
+}
+
+
 def say_hi(n: int = 1):
     """Print hi n times to terminal.
 
+    The rendered output is cached by the shared greeting engine, so repeated
+    calls with the same ``n`` cost a single write per 64 KiB.
+
     Args:
         n (int): Print hi ``n`` times to terminal.
     """
-    for _ in range(n):
-        print('hi')
+    default_engine.say('hi', n)
+
+
+def _fill_block(block: mmap.mmap, line: bytes) -> None:
+    """Fill ``block`` with repeated ``line`` by doubling the filled prefix."""
+    block[:len(line)] = line
+    filled = len(line)
+    while filled < len(block):
+        size = min(filled, len(block) - filled)
+        block[filled:filled + size] = block[:size]
+        filled += size
+
+
+def _sendfile_all(out_fd: int, in_fd: int, size: int, count: int) -> None:
+    """Send the first ``size`` bytes of ``in_fd`` to ``out_fd`` ``count``
+    times."""
+    for _ in range(count):
+        offset = 0
+        while offset < size:
+            offset += os.sendfile(out_fd, in_fd, offset, size - offset)
+
+
+def _writev_all(fd: int, view: memoryview, count: int) -> None:
+    """Write ``view`` to ``fd`` ``count`` times, batching the copies into as
+    few ``os.writev`` calls as ``IOV_MAX`` allows."""
+    try:
+        iov_max = os.sysconf('SC_IOV_MAX')
+    except (AttributeError, ValueError, OSError):
+        iov_max = 16
+    if iov_max <= 0:
+        iov_max = 16
+    while count:
+        batch = min(count, iov_max)
+        written = os.writev(fd, [view] * batch)
+        done, partial = divmod(written, len(view))
+        count -= done
+        if partial:
+            rest = view[partial:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+            count -= 1
+
+
+def _write_blocks(fd: int, block_file, block: mmap.mmap, size: int,
+                  count: int) -> None:
+    """Write the first ``size`` bytes of the template block ``count`` times,
+    preferring ``os.sendfile`` and falling back to ``os.writev``."""
+    if count == 0 or size == 0:
+        return
+    if hasattr(os, 'sendfile'):
+        try:
+            # send the first copy on its own so that an unsupported pair of
+            # file descriptors is detected before anything is written
+            _sendfile_all(fd, block_file.fileno(), size, 1)
+        except OSError as e:
+            if e.errno not in _SENDFILE_UNSUPPORTED:
+                raise
+        else:
+            _sendfile_all(fd, block_file.fileno(), size, count - 1)
+            return
+    view = memoryview(block)[:size]
+    try:
+        if hasattr(os, 'writev'):
+            _writev_all(fd, view, count)
+        else:
+            for _ in range(count):
+                rest = view
+                while rest:
+                    rest = rest[os.write(fd, rest):]
+    finally:
+        view.release()
+
+
+def say_hi_zero_copy(n: int = 1,
+                     file=None,
+                     block_size: int = DEFAULT_BLOCK_SIZE):
+    """Write hi n times to a file descriptor without building the output in
+    Python memory.
+
+    A template block of repeated ``hi`` lines is filled once in a
+    memory-mapped temporary file, then pushed to the target with
+    ``os.sendfile`` (or ``os.writev`` where ``sendfile`` is not supported for
+    the target) as many times as needed, followed by a prefix of the block for
+    the remaining lines. Peak memory only depends on ``block_size``.
+
+    Args:
+        n (int): Write hi ``n`` times.
+        file (IO | int, optional): A file descriptor or a file object backed
+            by one, such as a regular file, a pipe or a socket. File objects
+            are flushed before writing. Defaults to None, which means
+            ``sys.stdout``.
+        block_size (int): Upper bound of the size of the template block in
+            bytes. The block always holds at least one line. Defaults to
+            1048576.
+    """
+    if block_size <= 0:
+        raise ValueError(
+            f'block_size must be a positive integer, but got {block_size}')
+    if n <= 0:
+        return
+    if file is None:
+        file = sys.stdout
+    # imported here since tempfile is slow to import and only needed by
+    # this function
+    import tempfile
+
+    if isinstance(file, int):
+        fd = file
+    else:
+        file.flush()
+        fd = file.fileno()
+
+    line = b'hi\n'
+    lines_per_block = min(n, max(1, block_size // len(line)))
+    num_blocks, remainder = divmod(n, lines_per_block)
+    size = lines_per_block * len(line)
+
+    with tempfile.TemporaryFile() as block_file:
+        block_file.truncate(size)
+        block = mmap.mmap(block_file.fileno(), size)
+        try:
+            _fill_block(block, line)
+            _write_blocks(fd, block_file, block, size, num_blocks)
+            _write_blocks(fd, block_file, block, remainder * len(line), 1)
+        finally:
+            block.close()
+
+
+async def say_hi_async(n: int = 1,
+                       writer=None,
+                       batch_size: int = DEFAULT_BATCH_SIZE):
+    """Write hi n times to an async sink without blocking the event loop.
+
+    The lines are written in batches, and the sink is drained between
+    batches so a slow consumer applies backpressure. Cancelling the task
+    stops the stream within one batch.
+
+    Args:
+        n (int): Write hi ``n`` times.
+        writer: An :class:`asyncio.StreamWriter` or any object with a
+            ``write(data: bytes)`` method, which may return an awaitable.
+            Defaults to None, which means ``sys.stdout.buffer``.
+        batch_size (int): Upper bound of the size of each batch in bytes.
+            Defaults to 65536.
+
+    Examples:
+        >>> import asyncio
+        >>> import io
+        >>> sink = io.BytesIO()
+        >>> asyncio.run(say_hi_async(2, sink))
+        >>> sink.getvalue()
+        b'hi\\nhi\\n'
+    """
+    if writer is None:
+        sys.stdout.flush()
+        await write_lines_async('hi', n, sys.stdout.buffer, batch_size)
+        sys.stdout.buffer.flush()
+    else:
+        await write_lines_async('hi', n, writer, batch_size)
+
+
+def say_hi_concurrent(n: int = 1, writer=None):
+    """Print hi n times, safely from any number of threads at once.
+
+    The output is rendered in the calling thread and committed to a
+    :class:`~docs_example.greeting.CoalescingWriter`, whose background thread
+    coalesces the output of all threads into large writes. The output of one
+    call is never interleaved with the output of other calls, and threads do
+    not contend for the lock of stdout. The call returns before the output is
+    written.
+
+    Args:
+        n (int): Print hi ``n`` times.
+        writer (CoalescingWriter, optional): The writer to commit to.
+            Defaults to None, which means the writer to ``sys.stdout`` shared
+            by every thread, which writes everything before exit.
+
+    Examples:
+        >>> from docs_example.greeting import CoalescingWriter
+        >>> with CoalescingWriter() as writer:
+        ...     say_hi_concurrent(2, writer)
+        hi
+        hi
+    """
+    if writer is None:
+        writer = get_default_writer()
+    writer.say('hi', n)
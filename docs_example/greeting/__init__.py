@@ -0,0 +1,41 @@
+import importlib
+
+__all__ = [
+    'GreetingEngine', 'CacheInfo', 'default_engine', 'write_lines',
+    'write_lines_async', 'start_server', 'handle_connection',
+    'GreetingClient', 'GreetingConnection', 'run_load', 'CoalescingWriter',
+    'get_default_writer'
+]
+
+# The server, client and load generator depend on asyncio, which is slow to
+# import, so every submodule is imported on first attribute access (PEP 562).
+_LAZY_ATTRS = {
+    'GreetingEngine': '.engine',
+    'CacheInfo': '.engine',
+    'default_engine': '.engine',
+    'write_lines': '.stream',
+    'write_lines_async': '.stream',
+    'start_server': '.server',
+    'handle_connection': '.server',
+    'GreetingClient': '.client',
+    'GreetingConnection': '.client',
+    'run_load': '.loadgen',
+    'CoalescingWriter': '.writer',
+    'get_default_writer': '.writer',
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # cache the value so that __getattr__ is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,205 @@
+import asyncio
+from typing import Iterable, List, Optional, Tuple
+
+from .server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class GreetingConnection:
+    """A keep-alive connection to a greeting server.
+
+    Requests can be pipelined: :meth:`send` any number of requests, then
+    :meth:`receive` the responses in the same order.
+
+    Args:
+        reader (asyncio.StreamReader): The reading end of the connection.
+        writer (asyncio.StreamWriter): The writing end of the connection.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls,
+                   host: str = DEFAULT_HOST,
+                   port: int = DEFAULT_PORT,
+                   path: Optional[str] = None) -> 'GreetingConnection':
+        """Open a connection to a greeting server.
+
+        Args:
+            host (str): The host of the server. Defaults to '127.0.0.1'.
+            port (int): The TCP port of the server. Defaults to 8765.
+            path (str, optional): If given, connect to this Unix socket path
+                instead of a TCP port. Defaults to None.
+
+        Returns:
+            GreetingConnection: The opened connection.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def send(self, word: str, n: int) -> None:
+        """Queue a request without waiting for its response."""
+        self.writer.write(f'{word} {n}\n'.encode())
+
+    async def receive(self) -> bytes:
+        """Receive the response to the oldest pending request.
+
+        Returns:
+            bytes: The payload of the response.
+
+        Raises:
+            ValueError: If the server rejected the request.
+            ConnectionError: If the server closed the connection.
+        """
+        header = await self.reader.readline()
+        if not header:
+            raise ConnectionError('connection closed by the server')
+        status, _, detail = header.decode().rstrip('\n').partition(' ')
+        if status == 'ERR':
+            raise ValueError(detail)
+        return await self.reader.readexactly(int(detail))
+
+    async def request(self, word: str, n: int) -> bytes:
+        """Send a request and wait for its response."""
+        self.send(word, n)
+        await self.writer.drain()
+        return await self.receive()
+
+    async def pipeline(self, requests: Iterable[Tuple[str, int]]) -> list:
+        """Send a batch of requests at once and receive all the responses.
+
+        Args:
+            requests (Iterable[tuple]): The ``(word, n)`` requests.
+
+        Returns:
+            list: The payload of each request in order, or the
+            :class:`ValueError` raised for a rejected request.
+        """
+        count = 0
+        for word, n in requests:
+            self.send(word, n)
+            count += 1
+        await self.writer.drain()
+        results: List = []
+        for _ in range(count):
+            try:
+                results.append(await self.receive())
+            except ValueError as e:
+                results.append(e)
+        return results
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class GreetingClient:
+    """A client of the greeting server with a pool of keep-alive connections.
+
+    Connections are opened lazily, up to ``pool_size`` of them, and reused
+    across requests. A connection that fails with a connection error is
+    discarded instead of being returned to the pool.
+
+    Examples:
+        >>> async def main():
+        ...     async with GreetingClient(port=8765) as client:
+        ...         return await client.request('hello', 2)
+        >>> asyncio.run(main())  # doctest: +SKIP
+        b'hello\\nhello\\n'
+
+    Args:
+        host (str): The host of the server. Defaults to '127.0.0.1'.
+        port (int): The TCP port of the server. Defaults to 8765.
+        path (str, optional): If given, connect to this Unix socket path
+            instead of a TCP port. Defaults to None.
+        pool_size (int): Maximum number of open connections. Defaults to 8.
+    """
+
+    def __init__(self,
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 path: Optional[str] = None,
+                 pool_size: int = 8):
+        if pool_size <= 0:
+            raise ValueError(
+                f'pool_size must be a positive integer, but got {pool_size}')
+        self.host = host
+        self.port = port
+        self.path = path
+        self.pool_size = pool_size
+        self._idle: List[GreetingConnection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _acquire(self) -> GreetingConnection:
+        if self._semaphore is None:
+            # created lazily to bind to the running event loop
+            self._semaphore = asyncio.Semaphore(self.pool_size)
+        await self._semaphore.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await GreetingConnection.open(self.host, self.port,
+                                                 self.path)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def _release(self, conn: GreetingConnection, reuse: bool) -> None:
+        if reuse:
+            self._idle.append(conn)
+        else:
+            conn.writer.close()
+        self._semaphore.release()
+
+    async def request(self, word: str, n: int) -> bytes:
+        """Send a request on a pooled connection and wait for its response.
+
+        Args:
+            word (str): The word to greet with.
+            n (int): Number of repetitions.
+
+        Returns:
+            bytes: The payload of the response.
+
+        Raises:
+            ValueError: If the server rejected the request.
+        """
+        results = await self.pipeline([(word, n)])
+        if isinstance(results[0], ValueError):
+            raise results[0]
+        return results[0]
+
+    async def pipeline(self, requests: Iterable[Tuple[str, int]]) -> list:
+        """Pipeline a batch of requests on one pooled connection.
+
+        See :meth:`GreetingConnection.pipeline`.
+        """
+        conn = await self._acquire()
+        reuse = False
+        try:
+            results = await conn.pipeline(requests)
+            reuse = True
+            return results
+        finally:
+            self._release(conn, reuse)
+
+    async def close(self) -> None:
+        """Close all the idle connections."""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await conn.close()
+
+    async def __aenter__(self) -> 'GreetingClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
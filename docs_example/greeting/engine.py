@@ -0,0 +1,151 @@
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+from .stream import write_lines
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+# the size of the slices a cached payload is written in, since a text stream
+# encodes a whole string at once. Larger slices, above the mmap threshold of
+# malloc, are several times slower to allocate.
+WRITE_CHUNK_SIZE = 64 * 1024
+
+CacheInfo = namedtuple('CacheInfo',
+                       ['hits', 'misses', 'entries', 'currsize', 'maxsize'])
+
+
+class GreetingEngine:
+    """Render and write greetings, caching the rendered payloads.
+
+    The payload of a greeting, i.e. ``word`` followed by a newline repeated
+    ``n`` times, is rendered once per ``(word, n)`` and kept in a
+    least-recently-used cache bounded by the total size of the cached
+    payloads. Writing a cached greeting costs a single ``write`` call per
+    64 KiB, so that a text stream never holds more than 64 KiB of it
+    encoded.
+
+    Payloads larger than the whole budget are never cached. They are streamed
+    in chunks with :func:`~docs_example.greeting.write_lines` instead, so
+    memory stays bounded for any ``n``.
+
+    Examples:
+        >>> engine = GreetingEngine(max_bytes=1024)
+        >>> engine.say('hello', 2)
+        hello
+        hello
+        >>> engine.say('hello', 2)
+        hello
+        hello
+        >>> engine.cache_info()
+        CacheInfo(hits=1, misses=1, entries=1, currsize=12, maxsize=1024)
+
+    Args:
+        max_bytes (int): Upper bound of the total size in bytes of the cached
+            payloads. Defaults to 16777216.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError(
+                f'max_bytes must be a non-negative integer, but got '
+                f'{max_bytes}')
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._currsize = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def payload_size(word: str, n: int) -> int:
+        """int: Size in bytes of the encoded payload of a greeting."""
+        return (len(word.encode()) + 1) * max(n, 0)
+
+    def render(self, word: str, n: int, encoded: bool = False):
+        """Return the payload of a greeting, rendering it on a cache miss.
+
+        Args:
+            word (str): The word to greet with.
+            n (int): Number of repetitions.
+            encoded (bool): Whether to return the payload encoded in UTF-8.
+                The text and the encoded payloads are cached separately.
+                Defaults to False.
+
+        Returns:
+            str or bytes or None: The payload, or None if it does not fit in
+            the cache budget and should be streamed instead.
+        """
+        key = (word, n, encoded)
+        with self._lock:
+            payload = self._cache.get(key)
+            if payload is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return payload
+            self._misses += 1
+
+        size = self.payload_size(word, n)
+        if size > self.max_bytes:
+            return None
+        payload = f'{word}\n' * n
+        if encoded:
+            payload = payload.encode()
+
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = payload
+                self._currsize += size
+                while self._currsize > self.max_bytes:
+                    (old_word, old_n, _), _ = self._cache.popitem(
+                        last=False)
+                    self._currsize -= self.payload_size(old_word, old_n)
+        return payload
+
+    def say(self, word: str, n: int = 1, file=None) -> None:
+        """Write ``word`` ``n`` times to a text stream, one line each.
+
+        The output is identical to calling ``print(word, file=file)`` ``n``
+        times.
+
+        Args:
+            word (str): The word to greet with.
+            n (int): Number of repetitions. Defaults to 1.
+            file (IO, optional): A writable text stream. Defaults to None,
+                which means ``sys.stdout``.
+        """
+        if n <= 0:
+            return
+        if file is None:
+            file = sys.stdout
+        payload = self.render(word, n)
+        if payload is None:
+            write_lines(word, n, file)
+        elif len(payload) <= WRITE_CHUNK_SIZE:
+            file.write(payload)
+        else:
+            for start in range(0, len(payload), WRITE_CHUNK_SIZE):
+                file.write(payload[start:start + WRITE_CHUNK_SIZE])
+
+    def cache_info(self) -> CacheInfo:
+        """Return the statistics of the payload cache.
+
+        Returns:
+            CacheInfo: A named tuple of ``hits``, ``misses``, ``entries``,
+            ``currsize`` and ``maxsize``, where the sizes are in bytes.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._cache),
+                             self._currsize, self.max_bytes)
+
+    def cache_clear(self) -> None:
+        """Clear the payload cache and its statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._currsize = 0
+            self._hits = 0
+            self._misses = 0
+
+
+default_engine = GreetingEngine()
+"""GreetingEngine: The engine shared by :func:`say_hello` and
+:func:`say_hi`."""
@@ -0,0 +1,173 @@
+"""A load generator for the greeting server.
+
+Examples:
+    Benchmark a server started in a child process on a temporary Unix
+    socket, or an already running one::
+
+        $ python -m docs_example.greeting.loadgen --requests 100000
+        $ python -m docs_example.greeting.loadgen --port 8765 --n 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional, Sequence
+
+from .client import GreetingConnection
+from .server import DEFAULT_HOST
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Return the ``q``-th percentile of sorted values by nearest rank.
+
+    Args:
+        sorted_values (Sequence[float]): Values sorted in ascending order.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile, or ``nan`` if there is no value.
+    """
+    if not sorted_values:
+        return float('nan')
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[min(int(rank), len(sorted_values)) - 1]
+
+
+async def _worker(conn: GreetingConnection, word: str, n: int, batches: int,
+                  depth: int, latencies: List[float]) -> int:
+    received = 0
+    for _ in range(batches):
+        start = time.perf_counter()
+        for _ in range(depth):
+            conn.send(word, n)
+        await conn.writer.drain()
+        for _ in range(depth):
+            received += len(await conn.receive())
+            latencies.append(time.perf_counter() - start)
+    return received
+
+
+async def run_load(host: str = DEFAULT_HOST,
+                   port: int = 0,
+                   path: Optional[str] = None,
+                   word: str = 'hello',
+                   n: int = 1,
+                   requests: int = 10000,
+                   concurrency: int = 8,
+                   depth: int = 16) -> dict:
+    """Send greeting requests to a server and measure the throughput.
+
+    ``concurrency`` keep-alive connections are opened, and each of them
+    repeatedly pipelines ``depth`` requests before reading the responses. The
+    latency of a request is measured from the time its batch is sent to the
+    time its response is read.
+
+    Args:
+        host (str): The host of the server. Defaults to '127.0.0.1'.
+        port (int): The TCP port of the server. Defaults to 0.
+        path (str, optional): If given, connect to this Unix socket path
+            instead of a TCP port. Defaults to None.
+        word (str): The word to request. Defaults to 'hello'.
+        n (int): The number of repetitions to request. Defaults to 1.
+        requests (int): The total number of requests, rounded down to a
+            multiple of ``concurrency * depth``. Defaults to 10000.
+        concurrency (int): The number of connections. Defaults to 8.
+        depth (int): The number of pipelined requests per batch.
+            Defaults to 16.
+
+    Returns:
+        dict: The report, with the number of ``requests``, the payload
+        ``bytes`` received, the elapsed ``seconds``, ``requests_per_sec`` and
+        the ``p50_ms`` and ``p99_ms`` latencies.
+    """
+    batches = max(1, requests // (concurrency * depth))
+    conns = [
+        await GreetingConnection.open(host, port, path)
+        for _ in range(concurrency)
+    ]
+    latencies: List[float] = []
+    try:
+        start = time.perf_counter()
+        received = await asyncio.gather(*[
+            _worker(conn, word, n, batches, depth, latencies)
+            for conn in conns
+        ])
+        elapsed = time.perf_counter() - start
+    finally:
+        for conn in conns:
+            await conn.close()
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'bytes': sum(received),
+        'seconds': elapsed,
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def _spawn_server(path: str) -> subprocess.Popen:
+    """Start a server in a child process and wait until it accepts."""
+    proc = subprocess.Popen([
+        sys.executable, '-m', 'docs_example.greeting.server', '--path', path
+    ])
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            raise RuntimeError('the greeting server failed to start')
+        time.sleep(0.01)
+    return proc
+
+
+def main(args=None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark a local greeting server. Without --port or '
+        '--path, a server is started in a child process.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--path', help='connect to a Unix socket instead')
+    parser.add_argument('--word', default='hello')
+    parser.add_argument('--n', type=int, default=1)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--depth', type=int, default=16)
+    parser.add_argument(
+        '--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(args)
+
+    kwargs = dict(
+        word=args.word,
+        n=args.n,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        depth=args.depth)
+    if args.port is not None or args.path is not None:
+        report = asyncio.run(
+            run_load(args.host, args.port or 0, args.path, **kwargs))
+    else:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'greeting.sock')
+            proc = _spawn_server(path)
+            try:
+                report = asyncio.run(run_load(path=path, **kwargs))
+            finally:
+                proc.terminate()
+                proc.wait()
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(f"{report['requests']} requests in {report['seconds']:.3f}s: "
+              f"{report['requests_per_sec']:.0f} req/s, "
+              f"p50 {report['p50_ms']:.3f} ms, p99 {report['p99_ms']:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""A local asyncio server for greeting requests.
+
+The protocol is line based so that requests can be pipelined on keep-alive
+connections. A request is a single line::
+
+    <word> <n>\\n
+
+and the server answers every request in order with either::
+
+    OK <size>\\n<payload of size bytes>
+
+where the payload is ``word`` followed by a newline repeated ``n`` times, or::
+
+    ERR <message>\\n
+
+if the request is invalid or its payload is larger than the maximum payload
+size of the server. A connection stays open until the client closes it.
+
+Examples:
+    Serve greetings on a TCP port or on a Unix socket::
+
+        $ python -m docs_example.greeting.server --port 8765
+        $ python -m docs_example.greeting.server --path /tmp/greeting.sock
+"""
+import argparse
+import asyncio
+from typing import Optional, Tuple
+
+from .engine import GreetingEngine, default_engine
+from .stream import write_lines_async
+
+GREETINGS = ('hello', 'hi')
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_REQUEST_SIZE = 1024
+DEFAULT_MAX_PAYLOAD_SIZE = 64 * 1024 * 1024
+
+
+def parse_request(
+        line: bytes,
+        max_payload_size: int = DEFAULT_MAX_PAYLOAD_SIZE) -> Tuple[str, int]:
+    """Parse a request line.
+
+    Args:
+        line (bytes): The request line, with or without the newline.
+        max_payload_size (int): The maximum size in bytes of the requested
+            payload. Defaults to 67108864.
+
+    Returns:
+        tuple: The requested ``(word, n)``.
+
+    Raises:
+        ValueError: If the line is malformed, the word is not one of
+            :data:`GREETINGS`, ``n`` is negative or the payload is larger
+            than ``max_payload_size``.
+    """
+    parts = line.decode('ascii', 'replace').split()
+    if len(parts) != 2:
+        raise ValueError(f'expected "<word> <n>", but got {line!r}')
+    word, n = parts
+    if word not in GREETINGS:
+        raise ValueError(f'word must be one of {GREETINGS}, but got {word}')
+    try:
+        n = int(n)
+    except ValueError:
+        raise ValueError(f'n must be an integer, but got {n}') from None
+    if n < 0:
+        raise ValueError(f'n must be a non-negative integer, but got {n}')
+    size = GreetingEngine.payload_size(word, n)
+    if size > max_payload_size:
+        raise ValueError(f'the payload of {size} bytes is larger than the '
+                         f'maximum of {max_payload_size} bytes')
+    return word, n
+
+
+async def handle_connection(
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        engine: GreetingEngine = default_engine,
+        max_payload_size: int = DEFAULT_MAX_PAYLOAD_SIZE) -> None:
+    """Serve pipelined greeting requests on one connection until it closes.
+
+    Args:
+        reader (asyncio.StreamReader): The reading end of the connection.
+        writer (asyncio.StreamWriter): The writing end of the connection.
+        engine (GreetingEngine): The engine that renders the payloads.
+            Defaults to :data:`~docs_example.greeting.default_engine`.
+        max_payload_size (int): The maximum size in bytes of a payload,
+            larger requests are answered with ``ERR``. Defaults to 67108864.
+    """
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # the line exceeds the limit of the reader
+                writer.write(b'ERR request too long\n')
+                break
+            if not line:
+                break
+            try:
+                word, n = parse_request(line, max_payload_size)
+            except ValueError as e:
+                writer.write(f'ERR {e}\n'.encode())
+            else:
+                writer.write(f'OK {engine.payload_size(word, n)}\n'.encode())
+                payload = engine.render(word, n, encoded=True)
+                if payload is None:
+                    await write_lines_async(word, n, writer)
+                else:
+                    writer.write(payload)
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host: str = DEFAULT_HOST,
+                       port: int = DEFAULT_PORT,
+                       path: Optional[str] = None,
+                       engine: GreetingEngine = default_engine,
+                       max_payload_size: int = DEFAULT_MAX_PAYLOAD_SIZE):
+    """Start a greeting server.
+
+    Args:
+        host (str): The host to listen on. Defaults to '127.0.0.1'.
+        port (int): The TCP port to listen on. 0 picks a free port.
+            Defaults to 8765.
+        path (str, optional): If given, listen on this Unix socket path
+            instead of a TCP port. Defaults to None.
+        engine (GreetingEngine): The engine that renders the payloads.
+            Defaults to :data:`~docs_example.greeting.default_engine`.
+        max_payload_size (int): The maximum size in bytes of a payload.
+            Defaults to 67108864.
+
+    Returns:
+        asyncio.AbstractServer: The started server.
+    """
+
+    async def handle(reader, writer):
+        await handle_connection(reader, writer, engine, max_payload_size)
+
+    if path is not None:
+        return await asyncio.start_unix_server(
+            handle, path, limit=MAX_REQUEST_SIZE)
+    return await asyncio.start_server(
+        handle, host, port, limit=MAX_REQUEST_SIZE)
+
+
+async def serve_forever(
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        path: Optional[str] = None,
+        max_payload_size: int = DEFAULT_MAX_PAYLOAD_SIZE) -> None:
+    """Start a greeting server and serve until cancelled.
+
+    See :func:`start_server` for the arguments.
+    """
+    server = await start_server(
+        host, port, path, max_payload_size=max_payload_size)
+    async with server:
+        await server.serve_forever()
+
+
+def main(args=None) -> None:
+    parser = argparse.ArgumentParser(description='Serve greeting requests.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--path', help='listen on a Unix socket instead')
+    parser.add_argument(
+        '--max-payload-size',
+        type=int,
+        default=DEFAULT_MAX_PAYLOAD_SIZE,
+        help='maximum size in bytes of a payload, defaults to 67108864')
+    args = parser.parse_args(args)
+    try:
+        asyncio.run(
+            serve_forever(args.host, args.port, args.path,
+                          args.max_payload_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import io
+import os
+import sys
+from functools import partial
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+
+def _write_all(write, data: bytes) -> None:
+    """Call ``write`` until ``data`` is fully written, retrying short writes.
+
+    Args:
+        write (callable): An unbuffered write function, such as ``os.write``
+            bound to a file descriptor or ``io.RawIOBase.write``.
+        data (bytes): The data to write.
+    """
+    view = memoryview(data)
+    while view:
+        written = write(view)
+        # a non-blocking raw stream returns None if it would block
+        view = view[written or 0:]
+
+
+def write_lines(line: str,
+                n: int,
+                file=None,
+                buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+    """Write ``line`` followed by a newline ``n`` times in large chunks.
+
+    The output is byte-identical to calling ``print(line)`` ``n`` times, but
+    the lines are packed into chunks of at most ``buffer_size`` bytes, so the
+    number of writes is ``O(n / chunk)``.
+
+    Args:
+        line (str): The content of each line, without the newline.
+        n (int): Number of lines to write.
+        file (IO | int, optional): A writable text stream, binary stream or
+            file descriptor. Defaults to None, which means ``sys.stdout``.
+        buffer_size (int): Upper bound of the size of each chunk in bytes.
+            A chunk always holds at least one line. Defaults to 65536.
+    """
+    if buffer_size <= 0:
+        raise ValueError(
+            f'buffer_size must be a positive integer, but got {buffer_size}')
+    if n <= 0:
+        return
+    if file is None:
+        file = sys.stdout
+
+    line = f'{line}\n'
+    line_size = len(line.encode())
+    lines_per_chunk = min(n, max(1, buffer_size // line_size))
+    num_chunks, remainder = divmod(n, lines_per_chunk)
+
+    if isinstance(file, int):
+        write = partial(_write_all, partial(os.write, file))
+        chunk = (line * lines_per_chunk).encode()
+        step = line_size
+    elif isinstance(file, io.RawIOBase):
+        write = partial(_write_all, file.write)
+        chunk = (line * lines_per_chunk).encode()
+        step = line_size
+    elif isinstance(file, io.BufferedIOBase):
+        write = file.write
+        chunk = (line * lines_per_chunk).encode()
+        step = line_size
+    else:
+        write = file.write
+        chunk = line * lines_per_chunk
+        step = len(line)
+
+    for _ in range(num_chunks):
+        write(chunk)
+    if remainder:
+        write(chunk[:remainder * step])
+    flush = getattr(file, 'flush', None)
+    if flush is not None:
+        flush()
+
+
+async def write_lines_async(line: str,
+                            n: int,
+                            writer,
+                            batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """Write ``line`` followed by a newline ``n`` times to an async sink.
+
+    The lines are encoded and packed into batches of at most ``batch_size``
+    bytes. After every batch, the sink is drained (if it supports draining)
+    and control is handed back to the event loop, so a slow consumer applies
+    backpressure and a cancellation takes effect within one batch.
+
+    Args:
+        line (str): The content of each line, without the newline.
+        n (int): Number of lines to write.
+        writer: An :class:`asyncio.StreamWriter` or any object with a
+            ``write(data: bytes)`` method. ``write`` may return an awaitable,
+            which is awaited. If the object has a ``drain()`` coroutine
+            method, it is awaited after each batch.
+        batch_size (int): Upper bound of the size of each batch in bytes. A
+            batch always holds at least one line. Defaults to 65536.
+    """
+    # imported here since asyncio is slow to import and only needed by the
+    # async callers
+    import asyncio
+    import inspect
+
+    if batch_size <= 0:
+        raise ValueError(
+            f'batch_size must be a positive integer, but got {batch_size}')
+    if n <= 0:
+        return
+
+    data = f'{line}\n'.encode()
+    lines_per_batch = min(n, max(1, batch_size // len(data)))
+    num_batches, remainder = divmod(n, lines_per_batch)
+    batch = data * lines_per_batch
+    drain = getattr(writer, 'drain', None)
+
+    async def write(chunk: bytes) -> None:
+        result = writer.write(chunk)
+        if inspect.isawaitable(result):
+            await result
+        if drain is not None:
+            await drain()
+        # ``drain`` returns without suspending when the transport is not
+        # paused, so yield explicitly to keep the loop responsive and to
+        # make the task cancellable between batches
+        await asyncio.sleep(0)
+
+    for _ in range(num_batches):
+        await write(batch)
+    if remainder:
+        await write(batch[:remainder * len(data)])
@@ -0,0 +1,276 @@
+import atexit
+import os
+import sys
+import threading
+from collections import deque
+from functools import partial
+
+from .stream import _write_all
+
+DEFAULT_MAX_BATCH_BYTES = 1024 * 1024
+DEFAULT_MAX_QUEUED_BYTES = 16 * 1024 * 1024
+
+
+class CoalescingWriter:
+    """Write the greetings of many threads through one background thread.
+
+    Each call of :meth:`say` renders its whole payload in the calling thread
+    and commits it to a queue owned by that thread, so threads never wait on
+    each other's locks. A background thread drains the queues of every
+    thread and coalesces the committed payloads into large writes. The
+    payload of one call is always written contiguously, so the output of
+    concurrent calls never interleaves, and the calls of one thread are
+    written in order.
+
+    Payloads larger than ``max_batch_bytes`` are not rendered. They are
+    committed as a stream of chunks, which the background thread writes one
+    after another. The rendered payloads waiting to be written take at most
+    ``max_queued_bytes``: beyond that, a commit blocks until the background
+    thread has written enough, so memory stays bounded for any ``n`` and any
+    number of calls, even if the file is slower than the callers.
+
+    Examples:
+        >>> writer = CoalescingWriter()
+        >>> writer.say('hello', 2)
+        >>> writer.flush()
+        hello
+        hello
+        >>> writer.close()
+
+    Args:
+        file (IO | int, optional): A writable binary stream, text stream or
+            file descriptor. Defaults to None, which means the current
+            ``sys.stdout`` at each write.
+        max_batch_bytes (int): Upper bound of the size in bytes of a
+            coalesced write, and of a rendered payload. Defaults to 1048576.
+        max_queued_bytes (int): Upper bound of the size in bytes of the
+            committed payloads not written yet, except that a payload is
+            always accepted when nothing is queued. Defaults to 16777216.
+    """
+
+    def __init__(self,
+                 file=None,
+                 max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+                 max_queued_bytes: int = DEFAULT_MAX_QUEUED_BYTES):
+        if max_batch_bytes <= 0:
+            raise ValueError('max_batch_bytes must be a positive integer, '
+                             f'but got {max_batch_bytes}')
+        if max_queued_bytes <= 0:
+            raise ValueError('max_queued_bytes must be a positive integer, '
+                             f'but got {max_queued_bytes}')
+        self.file = file
+        self.max_batch_bytes = max_batch_bytes
+        self.max_queued_bytes = max_queued_bytes
+        self._local = threading.local()
+        # (thread, queue) of every thread which committed a payload
+        self._queues = []
+        self._queues_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # guards _closed and _queued, and is notified when bytes are written
+        self._space = threading.Condition(threading.Lock())
+        self._queued = 0
+        self._closed = False
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._run, name='CoalescingWriter', daemon=True)
+        self._thread.start()
+
+    def _queue(self) -> deque:
+        queue = getattr(self._local, 'queue', None)
+        if queue is None:
+            queue = self._local.queue = deque()
+            with self._queues_lock:
+                self._queues.append((threading.current_thread(), queue))
+        return queue
+
+    def commit(self, data) -> None:
+        """Commit data to be written contiguously by the background thread.
+
+        Blocks while ``max_queued_bytes`` are committed and not written yet.
+
+        Args:
+            data (bytes | Iterable[bytes]): The data, or an iterable of
+                chunks of data, which is consumed by the background thread.
+        """
+        size = len(data) if isinstance(data, bytes) else 0
+        queue = self._queue()
+        with self._space:
+            while True:
+                if self._error is not None:
+                    raise self._error
+                if self._closed:
+                    raise ValueError(
+                        'I/O operation on closed CoalescingWriter')
+                if (not self._queued
+                        or self._queued + size <= self.max_queued_bytes):
+                    break
+                self._space.wait()
+            # appended under the lock, so that close() cannot miss it
+            self._queued += size
+            queue.append(data)
+        # setting the event takes a lock, so skip it when the writer is
+        # already awake
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def say(self, word: str, n: int = 1) -> None:
+        """Commit ``word`` ``n`` times, one line each.
+
+        Args:
+            word (str): The word to greet with.
+            n (int): Number of repetitions. Defaults to 1.
+        """
+        if n <= 0:
+            return
+        line = f'{word}\n'.encode()
+        if len(line) * n <= self.max_batch_bytes:
+            self.commit(line * n)
+        else:
+            self.commit(_chunks(line, n, self.max_batch_bytes))
+
+    def flush(self) -> None:
+        """Wait until the data committed by the calling thread is written.
+
+        Raises:
+            OSError: If writing failed in the background thread.
+        """
+        if self._closed:
+            return
+        done = threading.Event()
+        self.commit(done)
+        done.wait()
+        if self._error is not None:
+            raise self._error
+
+    def close(self) -> None:
+        """Write all the committed data and stop the background thread."""
+        with self._space:
+            if self._closed:
+                return
+            self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            # cleared before draining, so that a commit during the drain
+            # wakes the writer up again
+            self._wakeup.clear()
+            closed = self._closed
+            try:
+                self._drain()
+            except Exception as e:
+                with self._space:
+                    self._error = e
+                    self._space.notify_all()
+                self._release_flushes()
+                return
+            if closed:
+                return
+
+    def _drain(self) -> None:
+        write = self._write_function()
+        batch = []
+        size = 0
+        with self._queues_lock:
+            queues = list(self._queues)
+        for thread, queue in queues:
+            while queue:
+                item = queue.popleft()
+                if isinstance(item, bytes):
+                    batch.append(item)
+                    size += len(item)
+                    if size < self.max_batch_bytes:
+                        continue
+                    item = None
+                if batch:
+                    self._write_batch(write, batch, size)
+                    batch = []
+                    size = 0
+                if isinstance(item, threading.Event):
+                    self._flush_file()
+                    item.set()
+                elif item is not None:
+                    for chunk in item:
+                        write(chunk)
+            if not thread.is_alive() and not queue:
+                with self._queues_lock:
+                    self._queues.remove((thread, queue))
+        if batch:
+            self._write_batch(write, batch, size)
+        self._flush_file()
+
+    def _write_batch(self, write, batch: list, size: int) -> None:
+        write(b''.join(batch))
+        with self._space:
+            self._queued -= size
+            self._space.notify_all()
+
+    def _release_flushes(self) -> None:
+        with self._queues_lock:
+            queues = list(self._queues)
+        for _, queue in queues:
+            for item in queue:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write_function(self):
+        file = sys.stdout if self.file is None else self.file
+        if isinstance(file, int):
+            return partial(_write_all, partial(os.write, file))
+        buffer = getattr(file, 'buffer', None)
+        if buffer is not None:
+            # a text stream, whose pending text must be written first
+            file.flush()
+            return buffer.write
+        if hasattr(file, 'encoding'):
+            # a text stream without a binary buffer, such as io.StringIO
+            return lambda data: file.write(data.decode())
+        return file.write
+
+    def _flush_file(self) -> None:
+        file = sys.stdout if self.file is None else self.file
+        if isinstance(file, int):
+            return
+        file = getattr(file, 'buffer', file)
+        flush = getattr(file, 'flush', None)
+        if flush is not None:
+            flush()
+
+
+def _chunks(line: bytes, n: int, chunk_size: int):
+    lines_per_chunk = max(1, chunk_size // len(line))
+    chunk = line * min(n, lines_per_chunk)
+    num_chunks, remainder = divmod(n, lines_per_chunk)
+    for _ in range(num_chunks):
+        yield chunk
+    if remainder:
+        yield chunk[:remainder * len(line)]
+
+
+_default_writer = None
+_default_writer_lock = threading.Lock()
+
+
+def get_default_writer() -> CoalescingWriter:
+    """Return the writer to ``sys.stdout`` shared by the concurrent
+    greetings, creating it on first use.
+
+    It is closed at exit, after writing all the committed data.
+    """
+    global _default_writer
+    if _default_writer is None:
+        with _default_writer_lock:
+            if _default_writer is None:
+                _default_writer = CoalescingWriter()
+                atexit.register(_default_writer.close)
+    return _default_writer
@@ -0,0 +1,375 @@
+"""Opt-in instrumentation of the public functions of ``docs_example``.
+
+When enabled, every instrumented function records its number of calls and
+errors, a histogram of its latency in fixed log-scale buckets and, for the
+greeting functions, the number of bytes written. The statistics can be
+exported as a snapshot dict or in the Prometheus text format.
+
+Instrumentation is enabled either by setting the ``DOCS_EXAMPLE_INSTRUMENT``
+environment variable to a non-empty value before ``docs_example`` is
+imported, or by calling :func:`enable`. It costs nothing when disabled:
+instead of checking a flag on every call, :func:`enable` replaces the
+functions by recording wrappers wherever ``docs_example`` modules and classes
+refer to them, and :func:`disable` puts the original functions back.
+
+Note:
+    References taken before :func:`enable` is called, e.g. by
+    ``from docs_example.example1 import say_hello`` in another module, keep
+    pointing to the original functions. Enable the instrumentation first, or
+    use the environment variable.
+
+Examples:
+    >>> from docs_example import instrument
+    >>> instrument.enable()
+    >>> from docs_example.example1 import say_hello
+    >>> say_hello(2)
+    hello
+    hello
+    >>> stats = instrument.snapshot()['say_hello']
+    >>> stats['calls'], stats['bytes']
+    (1, 12)
+    >>> instrument.disable()
+"""
+import bisect
+import functools
+import importlib
+import inspect
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+ENV_VAR = 'DOCS_EXAMPLE_INSTRUMENT'
+
+# upper bounds in seconds of the latency buckets, from 1us to about 16s
+BUCKETS = tuple(1e-6 * 2**i for i in range(25))
+
+# name -> (module, qualified name in the module, greeting word or None)
+TARGETS: Dict[str, Tuple[str, str, Optional[str]]] = {
+    'say_hello': ('docs_example.example1.hello', 'say_hello', 'hello'),
+    'say_hello_bulk':
+    ('docs_example.example1.hello', 'say_hello_bulk', 'hello'),
+    'say_hi': ('docs_example.example2.hi', 'say_hi', 'hi'),
+    'say_hello_async':
+    ('docs_example.example1.hello', 'say_hello_async', 'hello'),
+    'say_hi_zero_copy':
+    ('docs_example.example2.hi', 'say_hi_zero_copy', 'hi'),
+    'say_hi_async': ('docs_example.example2.hi', 'say_hi_async', 'hi'),
+    'say_hello_concurrent':
+    ('docs_example.example1.hello', 'say_hello_concurrent', 'hello'),
+    'say_hi_concurrent':
+    ('docs_example.example2.hi', 'say_hi_concurrent', 'hi'),
+    'module_level_function':
+    ('docs_example.style_guide.docstring', 'module_level_function', None),
+    'example_generator':
+    ('docs_example.style_guide.docstring', 'example_generator', None),
+}
+TARGETS.update({
+    f'ExampleClass.{method}': ('docs_example.style_guide.docstring',
+                               f'ExampleClass.{method}', None)
+    for method in ('__init__', 'return_string', 'return_dict', 'return_tuple',
+                   'argument_list_changed')
+})
+# the compact classes share these methods with ExampleClass, and are recorded
+# under their own names
+TARGETS.update({
+    f'{cls}.{method}': ('docs_example.style_guide.compact', f'{cls}.{method}',
+                        None)
+    for cls in ('SlottedExampleClass', 'ExampleClassRow')
+    for method in ('return_string', 'return_dict', 'return_tuple',
+                   'argument_list_changed')
+})
+
+
+class FunctionStats:
+    """Statistics of the calls of one function."""
+    __slots__ = ('calls', 'errors', 'seconds', 'buckets', 'bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        # one count per bucket, plus one for the calls above the last bound
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.bytes = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'seconds': self.seconds,
+            'buckets': dict(zip(BUCKETS + (float('inf'), ), self.buckets)),
+            'bytes': self.bytes,
+        }
+
+
+class Registry:
+    """A thread-safe registry of the statistics of instrumented functions."""
+
+    def __init__(self):
+        self._stats: Dict[str, FunctionStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self,
+               name: str,
+               seconds: float,
+               nbytes: int = 0,
+               error: bool = False) -> None:
+        """Record one call of the function ``name``."""
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = FunctionStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.seconds += seconds
+            stats.buckets[index] += 1
+            stats.bytes += nbytes
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Return a copy of the statistics of every recorded function.
+
+        Returns:
+            dict: Map each function name to a dict of its number of
+            ``calls`` and ``errors``, its total latency in ``seconds``, its
+            latency histogram ``buckets`` mapping each upper bound in seconds
+            to the number of calls in that bucket (not cumulative), and its
+            written ``bytes``.
+        """
+        with self._lock:
+            return {
+                name: stats.to_dict()
+                for name, stats in sorted(self._stats.items())
+            }
+
+    def reset(self) -> None:
+        """Forget all the recorded statistics."""
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self) -> str:
+        """Return the statistics in the Prometheus text exposition format.
+
+        Returns:
+            str: The ``docs_example_calls_total``,
+            ``docs_example_errors_total``, ``docs_example_bytes_total`` and
+            ``docs_example_call_seconds`` histogram metrics, labelled by
+            function.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def counter(metric: str, key: str, help: str) -> None:
+            lines.append(f'# HELP {metric} {help}')
+            lines.append(f'# TYPE {metric} counter')
+            for name, stats in snapshot.items():
+                lines.append(f'{metric}{{function="{name}"}} {stats[key]}')
+
+        counter('docs_example_calls_total', 'calls', 'Number of calls.')
+        counter('docs_example_errors_total', 'errors',
+                'Number of calls that raised an exception.')
+        counter('docs_example_bytes_total', 'bytes',
+                'Number of bytes written by greeting functions.')
+
+        metric = 'docs_example_call_seconds'
+        lines.append(f'# HELP {metric} Latency of calls in seconds.')
+        lines.append(f'# TYPE {metric} histogram')
+        for name, stats in snapshot.items():
+            cumulative = 0
+            for bound, count in stats['buckets'].items():
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric}_bucket{{function="{name}",'
+                             f'le="{le}"}} {cumulative}')
+            lines.append(
+                f'{metric}_sum{{function="{name}"}} {stats["seconds"]!r}')
+            lines.append(
+                f'{metric}_count{{function="{name}"}} {stats["calls"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """Write :meth:`to_prometheus` to a file atomically.
+
+        The text is written to a temporary file which then replaces
+        ``path``, so that a scraper, such as the textfile collector of the
+        Prometheus node exporter, never reads a partial file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+registry = Registry()
+"""Registry: The registry that the instrumented functions record into."""
+
+# name -> (original function, wrapper), filled while enabled
+_patched: Dict[str, Tuple[Callable, Callable]] = {}
+_patch_lock = threading.Lock()
+
+
+def _greeting_bytes(word: str) -> Callable:
+    line_size = len(word.encode()) + 1
+
+    def count(args: tuple, kwargs: dict) -> int:
+        n = args[0] if args else kwargs.get('n', 1)
+        return line_size * max(n, 0)
+
+    return count
+
+
+def _wrap(name: str, func: Callable, word: Optional[str]) -> Callable:
+    count_bytes = _greeting_bytes(word) if word is not None else None
+    record = registry.record
+    perf_counter = time.perf_counter
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException:
+                record(name, perf_counter() - start, error=True)
+                raise
+            nbytes = count_bytes(args, kwargs) if count_bytes else 0
+            record(name, perf_counter() - start, nbytes)
+            return result
+
+        return async_wrapper
+
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            # timed until the generator is exhausted or closed, rather than
+            # until it is created
+            start = perf_counter()
+            error = False
+            try:
+                yield from func(*args, **kwargs)
+            except GeneratorExit:
+                raise
+            except BaseException:
+                error = True
+                raise
+            finally:
+                record(name, perf_counter() - start, error=error)
+
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            record(name, perf_counter() - start, error=True)
+            raise
+        nbytes = count_bytes(args, kwargs) if count_bytes else 0
+        record(name, perf_counter() - start, nbytes)
+        return result
+
+    return wrapper
+
+
+def _rebind(replace: Callable) -> None:
+    """Replace the functions in the loaded ``docs_example`` modules and in
+    the classes they define.
+
+    ``replace`` is called with each value and, for a class member, its name
+    as ``<class>.<attribute>``, else None. It returns the replacement of the
+    value, or None to keep it.
+    """
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not (module_name == 'docs_example'
+                                  or module_name.startswith('docs_example.')):
+            continue
+        namespace = vars(module)
+        for key, value in list(namespace.items()):
+            replacement = replace(value, None)
+            if replacement is not None:
+                namespace[key] = replacement
+            elif isinstance(value, type) and value.__module__ == module_name:
+                for attr, member in list(vars(value).items()):
+                    replacement = replace(member,
+                                          f'{value.__qualname__}.{attr}')
+                    if replacement is not None:
+                        setattr(value, attr, replacement)
+
+
+def is_enabled() -> bool:
+    """bool: Whether the instrumentation is enabled."""
+    return bool(_patched)
+
+
+def enable() -> None:
+    """Enable the instrumentation of the functions of :data:`TARGETS`.
+
+    The modules defining them are imported if needed. Enabling twice has no
+    effect.
+    """
+    with _patch_lock:
+        if _patched:
+            return
+        # id of the original function -> (function, name, greeting word)
+        targets = {}
+        for name, (module_name, qualname, word) in TARGETS.items():
+            obj = importlib.import_module(module_name)
+            for part in qualname.split('.'):
+                obj = getattr(obj, part)
+            targets.setdefault(id(obj), (obj, name, word))
+
+        def replace(value, member_name):
+            target = targets.get(id(value))
+            if target is None:
+                return None
+            func, name, word = target
+            # a method shared by several classes is recorded under the name
+            # of each class
+            name = member_name or name
+            if name not in _patched:
+                _patched[name] = (func, _wrap(name, func, word))
+            return _patched[name][1]
+
+        _rebind(replace)
+
+
+def disable() -> None:
+    """Disable the instrumentation and restore the original functions.
+
+    The recorded statistics are kept until :func:`reset` is called.
+    """
+    with _patch_lock:
+        originals = {
+            id(wrapper): orig
+            for orig, wrapper in _patched.values()
+        }
+        _rebind(lambda value, _: originals.get(id(value)))
+        _patched.clear()
+
+
+def snapshot() -> Dict[str, dict]:
+    """Return :meth:`Registry.snapshot` of the :data:`registry`."""
+    return registry.snapshot()
+
+
+def reset() -> None:
+    """Forget the statistics recorded in the :data:`registry`."""
+    registry.reset()
+
+
+def to_prometheus() -> str:
+    """Return :meth:`Registry.to_prometheus` of the :data:`registry`."""
+    return registry.to_prometheus()
+
+
+def write_prometheus(path: str) -> None:
+    """Write :meth:`Registry.write_prometheus` of the :data:`registry`."""
+    registry.write_prometheus(path)
@@ -0,0 +1,416 @@
+"""Compact bilingual search index of the documentation.
+
+The index is an inverted index stored in one memory-mappable file. Its terms
+are sorted, so a query term matches every term it is a prefix of, which
+suits search-as-you-type. English text is split into lowercase words, and
+identifiers such as ``say_hello`` or ``CoalescingWriter`` are also split into
+their words. Chinese, Japanese and Korean text has no spaces between words,
+so it is indexed as overlapping character unigrams and bigrams.
+
+A query loads nothing but the header: the terms are binary searched in the
+mapped file, so a lookup takes well under a millisecond however large the
+index is.
+
+The layout of version 1 is, with all integers little-endian:
+
+- header: the magic ``DXSI``, the version (uint16), a reserved uint16, the
+  number of documents (uint32), the number of terms (uint32), and the
+  offsets of the document table, the term table, the postings and the
+  string pool (uint64 each).
+- document table: per document, the offset and size in the string pool of
+  its title and of its URL (uint32 each).
+- term table: per term, in sorted order of their UTF-8 bytes, the offset
+  and size in the string pool of the term, the index of its first posting
+  and its number of postings (uint32 each).
+- postings: per term, the documents containing it as the document index and
+  the number of occurrences (uint32 each), sorted by document.
+- string pool: the UTF-8 strings.
+
+Examples:
+    >>> import os
+    >>> import tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'search.idx')
+    >>> build_index(path, [
+    ...     Document('hello', 'say_hello', 'api/example1.html',
+    ...              'Print hello n times to terminal.'),
+    ...     Document('hi', '如何说 hi', 'tutorials/how-to-say-hi.html',
+    ...              '如何说 hi'),
+    ... ])
+    2
+    >>> with SearchIndex(path) as index:
+    ...     [hit.title for hit in index.search('say_hel')]
+    ...     [hit.url for hit in index.search('说')]
+    ['say_hello']
+    ['tutorials/how-to-say-hi.html']
+"""
+import hashlib
+import heapq
+import marshal
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections import Counter, namedtuple
+from operator import itemgetter
+from typing import Dict, Iterable, List
+
+MAGIC = b'DXSI'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHHIIQQQQ')
+_DOCUMENT = struct.Struct('<IIII')
+_TERM = struct.Struct('<IIII')
+_POSTING = struct.Struct('<II')
+
+# ideographs, kana and hangul, which are written without spaces
+_CJK = (r'\u2e80-\u2fdf\u3040-\u30ff\u3100-\u312f\u3190-\u31ff'
+        r'\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff')
+_TOKEN = re.compile(rf'[{_CJK}]+|[^\W{_CJK}]+')
+_CJK_RUN = re.compile(rf'[{_CJK}]')
+_WORD = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+# the occurrences of a term in a title count as many in the text
+TITLE_WEIGHT = 5
+# bumped when the tokenizer changes, which invalidates the cached term counts
+_CACHE_VERSION = (VERSION, 1, TITLE_WEIGHT)
+
+Document = namedtuple('Document', ['key', 'title', 'url', 'text'])
+Document.__doc__ = """A document to index.
+
+``key`` identifies the document across builds, such as the path of its
+source, so that it is only tokenized again when its content changed.
+"""
+
+Hit = namedtuple('Hit', ['title', 'url', 'score'])
+Hit.__doc__ = """A document matching a query, with its relevance score."""
+
+
+def _cjk_grams(run: str, bigrams_only: bool) -> List[str]:
+    if len(run) == 1:
+        return [run]
+    bigrams = [run[i:i + 2] for i in range(len(run) - 1)]
+    return bigrams if bigrams_only else list(run) + bigrams
+
+
+def tokenize(text: str, query: bool = False) -> List[str]:
+    """Split text into index terms.
+
+    Examples:
+        >>> tokenize('Print say_hello 3 times')
+        ['print', 'say_hello', 'say', 'hello', '3', 'times']
+        >>> tokenize('CoalescingWriter')
+        ['coalescingwriter', 'coalescing', 'writer']
+        >>> tokenize('如何说 hi')
+        ['如', '何', '说', '如何', '何说', 'hi']
+        >>> tokenize('如何说', query=True)
+        ['如何', '何说']
+
+    Args:
+        text (str): The text to split. Identifiers such as ``say_hello`` or
+            ``CoalescingWriter`` are also split into their words, unless
+            the text is a query.
+        query (bool): Whether the text is a query. CJK runs of a query are
+            only split into bigrams, which are more selective than the
+            unigrams, unless they are a single character. Defaults to False.
+
+    Returns:
+        list[str]: The terms, in order.
+    """
+    terms = []
+    for token in _TOKEN.findall(text):
+        if _CJK_RUN.match(token):
+            terms.extend(_cjk_grams(token, query))
+            continue
+        terms.append(token.lower())
+        if query:
+            continue
+        words = _WORD.findall(token)
+        if len(words) > 1:
+            terms.extend(word.lower() for word in words)
+    return terms
+
+
+def _text_hash(document: Document) -> str:
+    digest = hashlib.sha256()
+    for field in (document.title, document.url, document.text):
+        digest.update(field.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def build_index(path: str, documents: Iterable[Document]) -> int:
+    """Write the search index of the documents, updating it incrementally.
+
+    The term counts of each document are kept in ``<path>.cache`` with the
+    hash of the document, so only the documents added or changed since the
+    last build are tokenized again. The index file itself is then rewritten
+    atomically, which is cheap compared to tokenizing.
+
+    Args:
+        path (str): The path of the index file.
+        documents (Iterable[Document]): The documents to index. Documents
+            of the previous build which are missing are removed.
+
+    Returns:
+        int: The number of documents tokenized again.
+    """
+    cache_path = f'{path}.cache'
+    try:
+        with open(cache_path, 'rb') as f:
+            version, cache = marshal.loads(f.read())
+        if version != _CACHE_VERSION:
+            cache = {}
+    except (OSError, EOFError, ValueError, TypeError):
+        cache = {}
+
+    entries = {}
+    tokenized = 0
+    for document in documents:
+        digest = _text_hash(document)
+        entry = cache.get(document.key)
+        if entry is None or entry[0] != digest:
+            counts = Counter(tokenize(document.text))
+            for term in tokenize(document.title):
+                counts[term] += TITLE_WEIGHT
+            entry = (digest, document.title, document.url, dict(counts))
+            tokenized += 1
+        entries[document.key] = entry
+
+    _write_index(path, [entry[1:] for _, entry in sorted(entries.items())])
+    _atomic_write(cache_path, marshal.dumps((_CACHE_VERSION, entries)))
+    return tokenized
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_index(path: str, documents: List[tuple]) -> None:
+    pool = bytearray()
+    pool_offsets: Dict[bytes, int] = {}
+
+    def add_string(string: str) -> tuple:
+        data = string.encode()
+        offset = pool_offsets.get(data)
+        if offset is None:
+            offset = pool_offsets[data] = len(pool)
+            pool.extend(data)
+        return offset, len(data)
+
+    postings: Dict[bytes, List[tuple]] = {}
+    document_table = bytearray()
+    for doc_id, (title, url, counts) in enumerate(documents):
+        document_table += _DOCUMENT.pack(*add_string(title),
+                                         *add_string(url))
+        for term, count in counts.items():
+            postings.setdefault(term.encode(), []).append((doc_id, count))
+
+    term_table = bytearray()
+    posting_table = bytearray()
+    num_postings = 0
+    for term in sorted(postings):
+        term_postings = postings[term]
+        offset = pool_offsets.get(term)
+        if offset is None:
+            offset = pool_offsets[term] = len(pool)
+            pool.extend(term)
+        term_table += _TERM.pack(offset, len(term), num_postings,
+                                 len(term_postings))
+        for posting in term_postings:
+            posting_table += _POSTING.pack(*posting)
+        num_postings += len(term_postings)
+
+    documents_offset = _HEADER.size
+    terms_offset = documents_offset + len(document_table)
+    postings_offset = terms_offset + len(term_table)
+    strings_offset = postings_offset + len(posting_table)
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(documents), len(postings),
+                          documents_offset, terms_offset, postings_offset,
+                          strings_offset)
+    _atomic_write(
+        path,
+        b''.join((header, document_table, term_table, posting_table, pool)))
+
+
+# 1 + log(n) of the small numbers of occurrences of a term in a document
+_LOG_TF = [0.0] + [1 + math.log(n) for n in range(1, 256)]
+
+
+def _log_tf(occurrences: int) -> float:
+    if occurrences < len(_LOG_TF):
+        return _LOG_TF[occurrences]
+    return 1 + math.log(occurrences)
+
+
+class SearchIndex:
+    """A search index file, memory-mapped for queries.
+
+    Args:
+        path (str): The path of a file written by :func:`build_index`.
+
+    Raises:
+        ValueError: If the file is not a search index of a supported
+            version.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            # an empty file cannot be mapped
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(f'{path} is not a search index')
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, _, self._num_documents, self._num_terms,
+             self._documents_offset, self._terms_offset,
+             self._postings_offset,
+             self._strings_offset) = _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f'{path} is not a search index')
+            if version != VERSION:
+                raise ValueError(
+                    f'version must be {VERSION}, but got {version} in {path}')
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def __len__(self) -> int:
+        return self._num_documents
+
+    def _string(self, offset: int, size: int) -> bytes:
+        start = self._strings_offset + offset
+        return self._mmap[start:start + size]
+
+    def _term(self, index: int) -> tuple:
+        offset, size, first, count = _TERM.unpack_from(
+            self._mmap, self._terms_offset + index * _TERM.size)
+        return self._string(offset, size), first, count
+
+    def _lower_bound(self, term: bytes) -> int:
+        low, high = 0, self._num_terms
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle)[0] < term:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _postings(self, first: int, count: int) -> array:
+        # the postings as one array of alternating document indexes and
+        # numbers of occurrences, decoded in C
+        start = self._postings_offset + first * _POSTING.size
+        postings = array('I')
+        postings.frombytes(self._mmap[start:start + count * _POSTING.size])
+        if sys.byteorder == 'big':
+            postings.byteswap()
+        return postings
+
+    def terms(self, prefix: str) -> List[str]:
+        """Return the indexed terms starting with ``prefix``, in order."""
+        prefix_bytes = prefix.lower().encode()
+        terms = []
+        for index in range(self._lower_bound(prefix_bytes), self._num_terms):
+            term = self._term(index)[0]
+            if not term.startswith(prefix_bytes):
+                break
+            terms.append(term.decode())
+        return terms
+
+    def _expand(self, term: bytes, prefix: bool) -> List[tuple]:
+        # (weight, first posting, number of postings) of each indexed term
+        # matching the term
+        expansions = []
+        for index in range(self._lower_bound(term), self._num_terms):
+            indexed, first, count = self._term(index)
+            if indexed != term and not (prefix and indexed.startswith(term)):
+                break
+            # a completion weighs the share of it which was typed, so that
+            # exact matches come first
+            idf = math.log(1 + self._num_documents / count)
+            expansions.append((idf * len(term) / len(indexed), first, count))
+        return expansions
+
+    def document(self, doc_id: int) -> tuple:
+        """Return the title and URL of a document by index."""
+        title_offset, title_size, url_offset, url_size = \
+            _DOCUMENT.unpack_from(
+                self._mmap, self._documents_offset + doc_id * _DOCUMENT.size)
+        return (self._string(title_offset, title_size).decode(),
+                self._string(url_offset, url_size).decode())
+
+    def search(self, query: str, limit: int = 10) -> List[Hit]:
+        """Return the documents matching every term of a query.
+
+        The last term of the query also matches the terms it is a prefix of,
+        since it may not be typed completely yet.
+
+        Args:
+            query (str): The query, in any indexed language.
+            limit (int): The maximum number of hits. Defaults to 10.
+
+        Returns:
+            list[Hit]: The hits, from the most to the least relevant.
+        """
+        terms = tokenize(query, query=True)
+        if not terms:
+            return []
+        matches = [
+            self._expand(term.encode(), prefix=i == len(terms) - 1)
+            for i, term in enumerate(terms)
+        ]
+        # the documents are intersected as sets, in C, from the rarest term
+        # on, and only the documents matching every term are scored
+        matches.sort(key=lambda expansions: sum(e[2] for e in expansions))
+        occurrences = {}
+        candidates = None
+        for expansions in matches:
+            documents = set()
+            for _, first, count in expansions:
+                postings = self._postings(first, count)
+                occurrences[first] = dict(zip(postings[::2], postings[1::2]))
+                documents.update(occurrences[first].keys())
+            if candidates is None:
+                candidates = documents
+            else:
+                candidates &= documents
+            if not candidates:
+                return []
+        # sorted, so that ties are ordered by document
+        scores = dict.fromkeys(sorted(candidates), 0.0)
+        for expansions in matches:
+            # the best score of the indexed terms matching the term, so that
+            # a page listing many completions of a prefix does not outrank
+            # the page of one of them
+            best = {}
+            for weight, first, _ in expansions:
+                term_occurrences = occurrences[first]
+                term_scores = {
+                    doc_id: _log_tf(term_occurrences[doc_id]) * weight
+                    for doc_id in term_occurrences.keys() & candidates
+                }
+                if not best:
+                    best = term_scores
+                    continue
+                for doc_id, score in term_scores.items():
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] += score
+        best = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        return [Hit(*self.document(doc_id), score) for doc_id, score in best]
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mmap.close()
+
+    def __enter__(self) -> 'SearchIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
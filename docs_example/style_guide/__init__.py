@@ -1,3 +1,45 @@
-from .docstring import ExampleClass, example_generator, module_level_function
+import importlib
 
-__all__ = ['module_level_function', 'example_generator', 'ExampleClass']
+from .docstring import (ExampleClass, ExampleSequence, example_generator,
+                        example_generator_batched, module_level_function,
+                        module_level_function_batch)
+
+__all__ = [
+    'module_level_function', 'module_level_function_batch',
+    'example_generator', 'example_generator_batched', 'ExampleSequence',
+    'ExampleClass', 'SlottedExampleClass', 'ExampleClassArray',
+    'ExampleClassRow', 'save_many', 'load_many', 'ExampleClassReader',
+    'run_batch', 'map_module_level_function', 'map_example_class', 'Result'
+]
+
+# The compact layouts, the serialization and the parallel helpers are not
+# needed by most callers, and the serialization imports pickle and mmap, so
+# their modules are imported on first attribute access (PEP 562).
+_LAZY_ATTRS = {
+    'SlottedExampleClass': '.compact',
+    'ExampleClassArray': '.compact',
+    'ExampleClassRow': '.compact',
+    'save_many': '.serialization',
+    'load_many': '.serialization',
+    'ExampleClassReader': '.serialization',
+    'run_batch': '.parallel',
+    'map_module_level_function': '.parallel',
+    'map_example_class': '.parallel',
+    'Result': '.parallel',
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # cache the value so that __getattr__ is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,263 @@
+"""Compact memory layouts of :class:`~.docstring.ExampleClass`.
+
+:class:`SlottedExampleClass` behaves like ``ExampleClass`` but stores its
+attributes in slots instead of a per-instance ``__dict__``.
+:class:`ExampleClassArray` goes further and stores many instances column by
+column, handing out lightweight row proxies on access.
+"""
+from array import array
+from typing import Iterable, Iterator, List, Optional, Union
+
+from .docstring import ExampleClass
+
+
+class SlottedExampleClass:
+    """A variant of :class:`ExampleClass` without a per-instance ``__dict__``.
+
+    It has the same arguments, properties and methods as ``ExampleClass``,
+    but its attributes are stored in ``__slots__``, which makes each instance
+    several times smaller. As a consequence, no attribute can be added to an
+    instance.
+
+    Examples:
+        >>> obj = SlottedExampleClass(1, 'second parameter')
+        >>> obj.owner
+        'OpenMMLab'
+        >>> obj.return_tuple()
+        (1, 2)
+
+    Args:
+        arg1 (int): See :class:`ExampleClass`.
+        arg2 (str, optional): See :class:`ExampleClass`. Defaults to None.
+        arg3 (str): See :class:`ExampleClass`. Defaults to ``item1``.
+        arg4 (dict, optional): See :class:`ExampleClass`. Defaults to None.
+    """
+    __slots__ = ('arg1', 'arg2', 'arg3', 'arg4', '_owner')
+
+    _class_name = 'ExampleClass'
+
+    def __init__(self,
+                 arg1: int,
+                 arg2: Optional[str] = None,
+                 arg3: str = 'item1',
+                 arg4: Optional[dict] = None):
+        self.arg1 = arg1
+        self.arg2 = arg2
+        self.arg3 = arg3
+        self.arg4 = arg4
+        self._owner = 'OpenMMLab'
+
+    class_name = ExampleClass.class_name
+    owner = ExampleClass.owner
+    return_string = ExampleClass.return_string
+    return_dict = ExampleClass.return_dict
+    return_tuple = ExampleClass.return_tuple
+    argument_list_changed = ExampleClass.argument_list_changed
+
+
+class _StringColumn:
+    """A dictionary-encoded column of optional strings.
+
+    Each distinct string is stored once, and each row only stores the 4-byte
+    code of its string, where -1 stands for None.
+    """
+
+    def __init__(self):
+        self.codes = array('i')
+        self.values: List[str] = []
+        self._index = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value: Optional[str]) -> None:
+        self.codes.append(self.encode(value))
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        code = self.codes[index]
+        return None if code < 0 else self.values[code]
+
+    def __setitem__(self, index: int, value: Optional[str]) -> None:
+        self.codes[index] = self.encode(value)
+
+
+class ExampleClassRow:
+    """A lightweight proxy of one row of an :class:`ExampleClassArray`.
+
+    It supports the same properties and methods as :class:`ExampleClass`.
+    Reading or writing an attribute reads or writes the underlying columns,
+    so a row proxy stays in sync with its array.
+
+    Args:
+        array (ExampleClassArray): The array holding the row.
+        index (int): The index of the row in the array.
+    """
+    __slots__ = ('_array', '_index')
+
+    _class_name = 'ExampleClass'
+
+    def __init__(self, array: 'ExampleClassArray', index: int):
+        self._array = array
+        self._index = index
+
+    @property
+    def arg1(self) -> int:
+        """int: The ``arg1`` of the row."""
+        return self._array._arg1[self._index]
+
+    @arg1.setter
+    def arg1(self, value: int):
+        self._array._arg1[self._index] = value
+
+    @property
+    def arg2(self) -> Optional[str]:
+        """str or None: The ``arg2`` of the row."""
+        return self._array._arg2[self._index]
+
+    @arg2.setter
+    def arg2(self, value: Optional[str]):
+        self._array._arg2[self._index] = value
+
+    @property
+    def arg3(self) -> str:
+        """str: The ``arg3`` of the row."""
+        return self._array._arg3[self._index]
+
+    @arg3.setter
+    def arg3(self, value: str):
+        self._array._arg3[self._index] = value
+
+    @property
+    def arg4(self) -> Optional[dict]:
+        """dict or None: The ``arg4`` of the row."""
+        return self._array._arg4.get(self._index)
+
+    @arg4.setter
+    def arg4(self, value: Optional[dict]):
+        self._array._set_arg4(self._index, value)
+
+    @property
+    def _owner(self) -> str:
+        return self._array._owner[self._index]
+
+    @_owner.setter
+    def _owner(self, value: str):
+        self._array._owner[self._index] = value
+
+    class_name = ExampleClass.class_name
+    owner = ExampleClass.owner
+    return_string = ExampleClass.return_string
+    return_dict = ExampleClass.return_dict
+    return_tuple = ExampleClass.return_tuple
+    argument_list_changed = ExampleClass.argument_list_changed
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(arg1={self.arg1!r}, '
+                f'arg2={self.arg2!r}, arg3={self.arg3!r}, '
+                f'arg4={self.arg4!r}, owner={self.owner!r})')
+
+
+class ExampleClassArray:
+    """A columnar container of :class:`ExampleClass` instances.
+
+    The instances are stored as a struct of arrays: ``arg1`` in a typed
+    64-bit integer array, ``arg2``, ``arg3`` and ``owner`` as 4-byte codes
+    into per-column dictionaries of distinct strings, and ``arg4``, which is
+    usually None, in a sparse mapping from row index to value. Indexing
+    returns an :class:`ExampleClassRow` proxy.
+
+    Examples:
+        >>> rows = ExampleClassArray()
+        >>> rows.append(1, 'second parameter')
+        >>> rows.extend([ExampleClass(2), ExampleClass(3, arg3='item2')])
+        >>> len(rows), rows[2].arg3, rows[-1].owner
+        (3, 'item2', 'OpenMMLab')
+        >>> row = rows[0]
+        >>> row.owner = 'Someone'
+        >>> rows[0].owner, rows[0].return_string(1, 'a', {})
+        ('Someone', 'method1')
+
+    Args:
+        rows (Iterable, optional): Instances of :class:`ExampleClass`, or of
+            any class with the same attributes, to fill the array with.
+            Defaults to None.
+    """
+
+    def __init__(self, rows: Optional[Iterable] = None):
+        self._arg1 = array('q')
+        self._arg2 = _StringColumn()
+        self._arg3 = _StringColumn()
+        self._arg4 = {}
+        self._owner = _StringColumn()
+        if rows is not None:
+            self.extend(rows)
+
+    def append(self,
+               arg1: int,
+               arg2: Optional[str] = None,
+               arg3: str = 'item1',
+               arg4: Optional[dict] = None,
+               owner: str = 'OpenMMLab') -> None:
+        """Append a row built from the arguments of :class:`ExampleClass`.
+
+        Args:
+            owner (str): The owner of the row. Defaults to ``OpenMMLab``.
+        """
+        index = len(self._arg1)
+        self._arg1.append(arg1)
+        self._arg2.append(arg2)
+        self._arg3.append(arg3)
+        self._owner.append(owner)
+        self._set_arg4(index, arg4)
+
+    def extend(self, rows: Iterable) -> None:
+        """Append the attributes of each instance in ``rows``."""
+        for row in rows:
+            self.append(row.arg1, row.arg2, row.arg3, row.arg4, row.owner)
+
+    def _set_arg4(self, index: int, value: Optional[dict]) -> None:
+        if value is None:
+            self._arg4.pop(index, None)
+        else:
+            self._arg4[index] = value
+
+    def __len__(self) -> int:
+        return len(self._arg1)
+
+    def __getitem__(self, index: int) -> ExampleClassRow:
+        length = len(self._arg1)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('ExampleClassArray index out of range')
+        return ExampleClassRow(self, index)
+
+    def __iter__(self) -> Iterator[ExampleClassRow]:
+        for index in range(len(self._arg1)):
+            yield ExampleClassRow(self, index)
+
+    def to_objects(self,
+                   cls: type = ExampleClass
+                   ) -> List[Union[ExampleClass, SlottedExampleClass]]:
+        """Materialize the rows as instances of ``cls``.
+
+        Args:
+            cls (type): :class:`ExampleClass` or
+                :class:`SlottedExampleClass`. Defaults to ``ExampleClass``.
+
+        Returns:
+            list: The instances, in order.
+        """
+        objects = []
+        for row in self:
+            obj = cls(row.arg1, row.arg2, row.arg3, row.arg4)
+            obj.owner = row.owner
+            objects.append(obj)
+        return objects
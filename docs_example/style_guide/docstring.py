@@ -33,7 +33,12 @@ Todo:
    http://google.github.io/styleguide/pyguide.html
 """
 
-from typing import Optional, Union
+import operator
+import sys
+from array import array
+from collections.abc import Sequence
+from types import MappingProxyType
+from typing import Iterator, List, Mapping, Optional, Union
 
 module_level_variable1 = 12345
 module_level_variable2 = 98765
@@ -43,6 +48,9 @@ The docstring may span multiple lines. The type may optionally be specified
 on the first line, separated by a colon.
 """
 
+# the output of ``ExampleClass.return_dict(..., frozen=True)``
+_FROZEN_DICT = MappingProxyType({'key1': 'value1', 'key2': 'value2'})
+
 
 def module_level_function(param1, param2=None, *args, **kwargs):
     r"""This is an example of a module level function.
@@ -97,6 +105,60 @@ def module_level_function(param1, param2=None, *args, **kwargs):
     return True
 
 
+def module_level_function_batch(param1, param2=None):
+    """Batched variant of :func:`module_level_function` for many pairs.
+
+    Instead of raising :class:`ValueError` for the first invalid pair, all
+    the pairs are validated and the result of each one is returned. A pair
+    is valid if and only if :func:`module_level_function` returns True for
+    it, i.e. if ``param1 == param2`` is false.
+
+    If either input is a NumPy array, the comparison is vectorized with NumPy
+    and the outputs are NumPy arrays. Otherwise the pairs are compared in
+    pure Python and the outputs are lists.
+
+    Args:
+        param1 (Sequence | numpy.ndarray): The first parameter of each pair.
+        param2 (Sequence | numpy.ndarray, optional): The second parameter of
+            each pair, of the same length as `param1`. Defaults to None,
+            which means that the second parameter of every pair is None.
+
+    Returns:
+        tuple: A tuple ``(mask, invalid)``, where ``mask`` holds True for the
+        valid pairs and False for the others, and ``invalid`` holds the
+        indices of the invalid pairs in ascending order.
+
+    Raises:
+        ValueError: If `param1` and `param2` do not have the same length.
+
+    Examples:
+        >>> module_level_function_batch([1, 2, 3], [1, 0, 3])
+        ([False, True, False], [0, 2])
+    """
+    np = sys.modules.get('numpy')
+    if np is not None and (isinstance(param1, np.ndarray)
+                           or isinstance(param2, np.ndarray)):
+        param1 = np.asarray(param1)
+        if param2 is None:
+            param2 = np.full(param1.shape, None, dtype=object)
+        param2 = np.asarray(param2)
+        if param1.shape != param2.shape:
+            raise ValueError(
+                'param1 and param2 must have the same shape, but got '
+                f'{param1.shape} and {param2.shape}')
+        mask = ~np.asarray(param1 == param2, dtype=bool)
+        return mask, np.flatnonzero(~mask)
+
+    if param2 is None:
+        param2 = [None] * len(param1)
+    if len(param1) != len(param2):
+        raise ValueError(
+            'param1 and param2 must have the same length, but got '
+            f'{len(param1)} and {len(param2)}')
+    mask = [not equal for equal in map(operator.eq, param1, param2)]
+    return mask, [i for i, valid in enumerate(mask) if not valid]
+
+
 def example_generator(n):
     """Generators have a ``Yields`` section instead of a ``Returns`` section.
 
@@ -116,6 +178,229 @@ def example_generator(n):
     yield from range(n)
 
 
+def example_generator_batched(n, block_size=65536, output='array'):
+    """Batched variant of :func:`example_generator` yielding whole blocks.
+
+    Instead of resuming once per number, the generator yields the range of 0
+    to `n` - 1 in blocks of `block_size` numbers, so consumers can process
+    a whole block per resumption. The last block holds the remaining numbers
+    and may be shorter.
+
+    Args:
+        n (int): The upper limit of the range to generate, from 0 to `n` - 1.
+        block_size (int): The number of values in each block. Defaults to
+            65536.
+        output (str): The type of each block. Defaults to ``array``.
+
+            - array: an ``array.array`` with the ``q`` typecode.
+            - memoryview: a ``memoryview`` of an ``array.array`` with the
+              ``q`` typecode.
+            - numpy: a ``numpy.ndarray`` of ``int64``, which requires NumPy
+              to be installed.
+
+    Yields:
+        array | memoryview | numpy.ndarray: The next block of the range of 0
+        to `n` - 1.
+
+    Raises:
+        ValueError: If `block_size` is not positive or `output` is not
+            supported.
+        ImportError: If `output` is ``numpy`` but NumPy is not installed.
+
+    Examples:
+        >>> for block in example_generator_batched(5, block_size=2):
+        ...     print(block.tolist())
+        [0, 1]
+        [2, 3]
+        [4]
+    """
+    if block_size <= 0:
+        raise ValueError(
+            f'block_size must be a positive integer, but got {block_size}')
+    if output not in ('array', 'memoryview', 'numpy'):
+        raise ValueError(
+            'output must be one of "array", "memoryview" and "numpy", but got '
+            f'{output}')
+    # validate the arguments eagerly, the blocks are generated lazily
+    return _generate_blocks(n, block_size, output)
+
+
+def _generate_blocks(n, block_size, output):
+    if output == 'numpy':
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError(
+                'NumPy is required for output="numpy", please install it by '
+                '"pip install numpy"') from None
+        for start in range(0, n, block_size):
+            yield np.arange(start, min(start + block_size, n), dtype=np.int64)
+        return
+
+    # Filling an array from a range converts every number one by one.
+    # Instead, the items of a block are handled as one big integer whose
+    # 64-bit digits are the items, see `_block_ints`. Adding `start` to every
+    # item is then a single big integer operation done in C.
+    size = min(block_size, n)
+    if size <= 0:
+        return
+    base, ones = _block_ints(size)
+    for start in range(0, n, size):
+        count = min(size, n - start)
+        data = (base + start * ones).to_bytes(8 * size, 'little')
+        block = array('q')
+        block.frombytes(data[:8 * count])
+        if sys.byteorder == 'big':
+            block.byteswap()
+        yield memoryview(block) if output == 'memoryview' else block
+
+
+# Only the integers of the default `block_size` of `example_generator_batched`
+# are kept, 1 MiB in total. Those of other sizes are freed with the generator.
+_CACHED_BLOCK_SIZE = 65536
+_cached_block_ints = None
+
+
+def _block_ints(size):
+    """Return the big integers whose little-endian 64-bit digits are 0 to
+    `size` - 1 and `size` ones, respectively.
+
+    They are built by doubling: the upper half of a block is its lower half
+    plus the length of the lower half, so no item is converted on its own.
+    """
+    global _cached_block_ints
+    if size == _CACHED_BLOCK_SIZE:
+        if _cached_block_ints is None:
+            _cached_block_ints = _build_block_ints(size)
+        return _cached_block_ints
+    return _build_block_ints(size)
+
+
+def _build_block_ints(size):
+    base, ones, count = 0, 1, 1
+    while count < size:
+        base |= (base + count * ones) << (64 * count)
+        ones |= ones << (64 * count)
+        count *= 2
+    mask = (1 << (64 * size)) - 1
+    return base & mask, ones & mask
+
+
+class ExampleSequence(Sequence):
+    """A lazy, random-access view of what :func:`example_generator` yields.
+
+    The numbers are computed on access instead of being stored, so the
+    length, indexing, membership tests and slicing all cost O(1) whatever
+    the size of the sequence is. Slicing returns another lazy view.
+
+    Examples:
+        >>> seq = ExampleSequence(10)
+        >>> len(seq), seq[3], seq[-1], 7 in seq
+        (10, 3, 9, True)
+        >>> seq, seq[2:8:2]
+        (ExampleSequence(10), <ExampleSequence start=2 stop=8 step=2>)
+        >>> list(seq[2:8:2])
+        [2, 4, 6]
+        >>> list(seq.iter_from(8))
+        [8, 9]
+
+    Args:
+        n (int): The upper limit of the range, from 0 to `n` - 1.
+    """
+
+    def __init__(self, n: int):
+        self._range = range(n)
+
+    @classmethod
+    def _from_range(cls, r: range) -> 'ExampleSequence':
+        seq = cls.__new__(cls)
+        seq._range = r
+        return seq
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return self._from_range(self._range[index])
+        return self._range[index]
+
+    def __contains__(self, value) -> bool:
+        return value in self._range
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._range)
+
+    def __reversed__(self) -> Iterator[int]:
+        return reversed(self._range)
+
+    def index(self, value, start: int = 0, stop: Optional[int] = None) -> int:
+        """Return the first index of `value` in O(1).
+
+        Raises:
+            ValueError: If `value` is not in the sequence.
+        """
+        positions = range(len(self._range))[start:stop]
+        return positions[self._range[start:stop].index(value)]
+
+    def count(self, value) -> int:
+        """Return the number of occurrences of `value` in O(1)."""
+        return self._range.count(value)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ExampleSequence):
+            return self._range == other._range
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._range)
+
+    def __repr__(self) -> str:
+        name = self.__class__.__name__
+        r = self._range
+        if r.start == 0 and r.step == 1:
+            return f'{name}({r.stop})'
+        # a slice cannot be passed to the constructor
+        return f'<{name} start={r.start} stop={r.stop} step={r.step}>'
+
+    def iter_from(self, offset: int) -> Iterator[int]:
+        """Iterate from the `offset`-th item without visiting the prefix.
+
+        Args:
+            offset (int): The index to start from. Negative values count
+                from the end.
+
+        Returns:
+            Iterator[int]: An iterator over the items from `offset` on.
+        """
+        return iter(self._range[offset:])
+
+    def split(self, num_parts: int) -> List['ExampleSequence']:
+        """Split the sequence into contiguous lazy views of similar lengths.
+
+        The views are cheap to pickle, so they can be sent to workers which
+        iterate over their own part without materializing anything.
+
+        Args:
+            num_parts (int): The number of parts.
+
+        Returns:
+            list[ExampleSequence]: `num_parts` views whose lengths differ by
+            at most one and which cover the sequence in order.
+        """
+        if num_parts <= 0:
+            raise ValueError(
+                f'num_parts must be a positive integer, but got {num_parts}')
+        size, extra = divmod(len(self), num_parts)
+        parts = []
+        start = 0
+        for i in range(num_parts):
+            stop = start + size + (i < extra)
+            parts.append(self[start:stop])
+            start = stop
+        return parts
+
+
 class ExampleClass:
     r"""The summary line for a class docstring should fit on one line.
 
@@ -161,9 +446,9 @@ class ExampleClass:
 
     Examples:
         >>> # initialization
-        >>> obj = ClassDocstring(1)
+        >>> obj = ExampleClass(1)
         >>> # give a few more examples
-        >>> obj = ClassDocstring(1, 'second parameter')
+        >>> obj = ExampleClass(1, 'second parameter')
 
     Args:
         arg1 (int): ``arg1`` is the first parameter. If we want to quote a link
@@ -298,13 +583,22 @@ class ExampleClass:
         """
         return 'method1'
 
-    def return_dict(self, arg1: int, arg2: Union[str, list],
-                    arg3: dict) -> dict:
+    def return_dict(self,
+                    arg1: int,
+                    arg2: Union[str, list],
+                    arg3: dict,
+                    frozen: bool = False) -> Mapping:
         """Summarize the function of the method in one sentence.
 
         Describe the function of the class in a few sentences. Of course,
         it is not required.
 
+        Note:
+            The output does not depend on the state of the instance, so with
+            ``frozen=True`` every call returns the same read-only mapping and
+            allocates nothing, which suits tight loops. ``return_string`` and
+            ``return_tuple`` always return shared immutable constants.
+
         Args:
             arg1 (int): ``arg1`` is the first parameter.
             arg2 (str | list): ``arg2`` is the second parameter. This parameter
@@ -314,12 +608,19 @@ class ExampleClass:
 
                 - key1: This is a shot description of the item.
                 - key1: This is a shot description of the item.
+            frozen (bool): Whether to return a shared read-only mapping
+                instead of a new dict. Defaults to False.
 
         Returns:
-            dict: Return the output where the keys denote A meaning and values
-            denote B. Be careful to the indentation alignment between lines
-            otherwise there will be unexpected rendering result.
+            dict | MappingProxyType: Return the output where the keys denote
+            A meaning and values denote B. Be careful to the indentation
+            alignment between lines otherwise there will be unexpected
+            rendering result. The output is a new dict, or, if `frozen` is
+            True, a read-only :class:`types.MappingProxyType` shared by all
+            the calls.
         """
+        if frozen:
+            return _FROZEN_DICT
         return {'key1': 'value1', 'key2': 'value2'}
 
     def return_tuple(self) -> tuple:
@@ -0,0 +1,178 @@
+"""Batch execution of the style guide functions on a pool of workers.
+
+Each item of a batch is evaluated independently, and its exception, such as
+the :class:`ValueError` of :func:`~.docstring.module_level_function`, is
+reported in its result instead of aborting the whole batch.
+
+The items are grouped into chunks, so that the overhead of sending work to a
+worker process is paid per chunk rather than per item. Results come back in
+the order of the items.
+"""
+import os
+import sys
+from collections import namedtuple
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from .docstring import ExampleClass, module_level_function
+
+Result = namedtuple('Result', ['value', 'error'])
+Result.__doc__ = """The result of one item of a batch.
+
+Either ``error`` is None and ``value`` is the return value of the call, or
+``error`` is the exception raised by the call and ``value`` is None.
+"""
+
+EXECUTORS = ('auto', 'process', 'thread')
+
+
+def is_free_threaded() -> bool:
+    """bool: Whether the interpreter runs without the GIL."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def auto_chunksize(num_items: int, num_workers: int) -> int:
+    """Return a chunk size that gives each worker about 4 chunks.
+
+    A few chunks per worker balance the load when items take different
+    times, while keeping the number of round trips to the workers small.
+
+    Args:
+        num_items (int): The number of items of the batch.
+        num_workers (int): The number of workers.
+
+    Returns:
+        int: The number of items per chunk, at least 1.
+    """
+    chunksize, extra = divmod(num_items, num_workers * 4)
+    return max(1, chunksize + bool(extra))
+
+
+def _run_chunk(func: Callable, chunk: Sequence[tuple]) -> List[Result]:
+    results = []
+    for args in chunk:
+        try:
+            results.append(Result(func(*args), None))
+        except Exception as e:
+            results.append(Result(None, e))
+    return results
+
+
+def run_batch(func: Callable,
+              items: Iterable[tuple],
+              executor: str = 'auto',
+              max_workers: Optional[int] = None,
+              chunksize: Optional[int] = None) -> List[Result]:
+    """Call ``func(*args)`` for each ``args`` of ``items`` on a pool.
+
+    Args:
+        func (callable): The function to call. With the process executor,
+            it must be picklable, e.g. defined at the top level of a module.
+        items (Iterable[tuple]): The positional arguments of each call.
+        executor (str): The kind of pool. Defaults to ``auto``.
+
+            - auto: ``thread`` on free-threaded builds of Python, where
+              threads run in parallel, and ``process`` otherwise.
+            - process: a :class:`~concurrent.futures.ProcessPoolExecutor`.
+            - thread: a :class:`~concurrent.futures.ThreadPoolExecutor`.
+        max_workers (int, optional): The number of workers. Defaults to None,
+            which means the number of CPUs.
+        chunksize (int, optional): The number of items sent to a worker at
+            once. Defaults to None, which means :func:`auto_chunksize`.
+
+    Returns:
+        list[Result]: The result of each item, in the order of ``items``.
+
+    Raises:
+        ValueError: If ``executor`` is not supported.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f'executor must be one of {EXECUTORS}, but got {executor}')
+    if executor == 'auto':
+        executor = 'thread' if is_free_threaded() else 'process'
+    items = list(items)
+    if not items:
+        return []
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = auto_chunksize(len(items), max_workers)
+    chunks = [
+        items[start:start + chunksize]
+        for start in range(0, len(items), chunksize)
+    ]
+
+    # imported here since concurrent.futures is slow to import
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    pool_cls = ProcessPoolExecutor if executor == 'process' else \
+        ThreadPoolExecutor
+    results: List[Result] = []
+    with pool_cls(max_workers=max_workers) as pool:
+        for chunk_results in pool.map(_run_chunk, [func] * len(chunks),
+                                      chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def call_example_class(init_args: tuple, method: str, *args: Any) -> Any:
+    """Build an :class:`ExampleClass` and call one of its methods.
+
+    It is a picklable helper to batch method calls with :func:`run_batch`.
+
+    Args:
+        init_args (tuple): The positional arguments of ``ExampleClass``.
+        method (str): The name of the method to call.
+        *args: The positional arguments of the method.
+
+    Returns:
+        Any: The return value of the method.
+    """
+    return getattr(ExampleClass(*init_args), method)(*args)
+
+
+def map_module_level_function(pairs: Iterable[tuple],
+                              **kwargs) -> List[Result]:
+    """Evaluate :func:`module_level_function` for many argument tuples.
+
+    Examples:
+        >>> results = map_module_level_function([(1, 2), (3, 3)],
+        ...                                     executor='thread')
+        >>> results[0]
+        Result(value=True, error=None)
+        >>> results[1].error
+        ValueError('param1 may not be equal to param2')
+
+    Args:
+        pairs (Iterable[tuple]): The positional arguments of each call, such
+            as ``(param1, param2)``.
+        **kwargs: The keyword arguments of :func:`run_batch`.
+
+    Returns:
+        list[Result]: The result of each call, in order.
+    """
+    return run_batch(module_level_function, pairs, **kwargs)
+
+
+def map_example_class(method: str, items: Iterable[tuple],
+                      **kwargs) -> List[Result]:
+    """Evaluate an :class:`ExampleClass` method for many instances.
+
+    Examples:
+        >>> results = map_example_class(
+        ...     'return_string', [((1, ), (1, 'a', {}))], executor='thread')
+        >>> results[0].value
+        'method1'
+
+    Args:
+        method (str): The name of the method, such as ``return_string``.
+        items (Iterable[tuple]): Pairs of the positional arguments of
+            ``ExampleClass`` and of the method.
+        **kwargs: The keyword arguments of :func:`run_batch`.
+
+    Returns:
+        list[Result]: The result of each call, in order.
+    """
+    return run_batch(
+        call_example_class,
+        ((init_args, method, *args) for init_args, args in items), **kwargs)
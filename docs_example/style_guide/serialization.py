@@ -0,0 +1,261 @@
+"""Compact binary serialization of :class:`~.docstring.ExampleClass`.
+
+A file stores a collection of instances in fixed-size records, so that any
+record can be located and decoded without reading the others. The layout of
+version 2 is, with all integers little-endian:
+
+- header: the magic ``DEXC``, the version (uint16), a reserved uint16, the
+  number of records (uint64), the offset of the string table (uint64) and
+  the offset of the ``arg4`` section (uint64).
+- records: per instance, ``arg1`` (int64), the codes of ``arg2``, ``arg3``
+  and ``owner`` in the string table (int32, -1 for None) and the offset of
+  ``arg4`` in the ``arg4`` section (int64, -1 for None).
+- string table: the number of distinct strings (uint32), then the offsets
+  of the strings in the string data (uint64 each, followed by the end of the
+  string data), then the string data, the UTF-8 bytes of every string. A
+  string is located from its code without reading the others.
+- ``arg4`` section: each non-None ``arg4`` as its size (uint32) followed by
+  its pickle.
+
+Warning:
+    ``arg4`` is serialized with :mod:`pickle`, so only load files from
+    trusted sources.
+"""
+import functools
+import mmap
+import os
+import pickle
+import struct
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Union
+
+from .docstring import ExampleClass
+
+MAGIC = b'DEXC'
+VERSION = 2
+
+_HEADER = struct.Struct('<4sHHQQQ')
+_RECORD = struct.Struct('<qiiiq')
+_SIZE = struct.Struct('<I')
+_OFFSET = struct.Struct('<Q')
+_SPAN = struct.Struct('<QQ')
+
+# the number of decoded strings each reader caches
+_STRING_CACHE_SIZE = 4096
+
+
+def save_many(objects: Iterable, path: str) -> int:
+    """Save instances of :class:`ExampleClass` to a binary file.
+
+    Args:
+        objects (Iterable): Instances of :class:`ExampleClass`, or of any
+            class with the same attributes, such as
+            :class:`~.compact.SlottedExampleClass`.
+        path (str): The path of the file to write.
+
+    Returns:
+        int: The number of saved instances.
+    """
+    # imported here since tempfile is slow to import
+    import shutil
+    import tempfile
+
+    codes = {}
+    strings: List[bytes] = []
+
+    def encode(value):
+        if value is None:
+            return -1
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(strings)
+            strings.append(value.encode())
+        return code
+
+    count = 0
+    # the arg4 section follows the records, so the pickles are streamed to a
+    # temporary file and copied after the string table
+    with open(path, 'wb') as f, tempfile.TemporaryFile() as blobs:
+        f.write(b'\0' * _HEADER.size)
+        pack = _RECORD.pack
+        blobs_size = 0
+        for obj in objects:
+            if obj.arg4 is None:
+                arg4_offset = -1
+            else:
+                arg4_offset = blobs_size
+                blob = pickle.dumps(obj.arg4, pickle.HIGHEST_PROTOCOL)
+                blobs.write(_SIZE.pack(len(blob)))
+                blobs.write(blob)
+                blobs_size += _SIZE.size + len(blob)
+            f.write(
+                pack(obj.arg1, encode(obj.arg2), encode(obj.arg3),
+                     encode(obj.owner), arg4_offset))
+            count += 1
+
+        strings_offset = f.tell()
+        f.write(_SIZE.pack(len(strings)))
+        offset = 0
+        for string in strings:
+            f.write(_OFFSET.pack(offset))
+            offset += len(string)
+        f.write(_OFFSET.pack(offset))
+        for string in strings:
+            f.write(string)
+        blobs_offset = f.tell()
+        blobs.seek(0)
+        shutil.copyfileobj(blobs, f)
+
+        f.seek(0)
+        f.write(
+            _HEADER.pack(MAGIC, VERSION, 0, count, strings_offset,
+                         blobs_offset))
+    return count
+
+
+class ExampleClassReader(Sequence):
+    """A lazy, read-only sequence of the instances saved in a binary file.
+
+    The file is memory-mapped, so opening it only reads the header, and each
+    record and string is decoded when it is accessed. The most recently
+    decoded strings are cached, but decoded instances are not, and changing
+    them does not change the file.
+
+    Examples:
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'objects.bin')
+        >>> save_many([ExampleClass(1), ExampleClass(2, 'a')], path)
+        2
+        >>> with load_many(path) as reader:
+        ...     print(len(reader), reader[1].arg1, reader[1].arg2)
+        2 2 a
+
+    Args:
+        path (str): The path of a file written by :func:`save_many`.
+        cls (type): The class to decode the records into. It must accept
+            the arguments of :class:`ExampleClass` and have an ``owner``
+            setter. Defaults to :class:`ExampleClass`.
+
+    Raises:
+        ValueError: If the file is not written by :func:`save_many` or is of
+            an unsupported version.
+    """
+
+    def __init__(self, path: str, cls: type = ExampleClass):
+        self.path = path
+        self.cls = cls
+        with open(path, 'rb') as f:
+            # checked before mapping, since an empty file cannot be mapped
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(
+                    f'{self.path} is too short to be a valid file')
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(
+                f'{self.path} is truncated or not a valid file') from None
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def _read_header(self) -> None:
+        buf = self._mmap
+        magic, version, _, count, strings_offset, blobs_offset = \
+            _HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError(f'{self.path} is not an ExampleClass file')
+        if version != VERSION:
+            raise ValueError(
+                f'unsupported version {version} of {self.path}, only version '
+                f'{VERSION} is supported')
+        self._count = count
+        self._blobs_offset = blobs_offset
+
+        (num_strings, ) = _SIZE.unpack_from(buf, strings_offset)
+        self._string_offsets = strings_offset + _SIZE.size
+        self._string_data = (self._string_offsets +
+                             (num_strings + 1) * _OFFSET.size)
+        # the end of the string data, which fails if the table is truncated
+        _OFFSET.unpack_from(buf, self._string_data - _OFFSET.size)
+        self._string = functools.lru_cache(_STRING_CACHE_SIZE)(
+            self._decode_string)
+
+    def _decode_string(self, code: int) -> str:
+        offset = self._string_offsets + code * _OFFSET.size
+        start, end = _SPAN.unpack_from(self._mmap, offset)
+        data = self._string_data
+        return self._mmap[data + start:data + end].decode()
+
+    def _decode(self, arg1: int, arg2: int, arg3: int, owner: int,
+                arg4_offset: int):
+        string = self._string
+        if arg4_offset < 0:
+            arg4 = None
+        else:
+            offset = self._blobs_offset + arg4_offset
+            (size, ) = _SIZE.unpack_from(self._mmap, offset)
+            offset += _SIZE.size
+            arg4 = pickle.loads(self._mmap[offset:offset + size])
+        obj = self.cls(arg1, None if arg2 < 0 else string(arg2),
+                       None if arg3 < 0 else string(arg3), arg4)
+        obj.owner = None if owner < 0 else string(owner)
+        return obj
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(self._count)[index]]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('ExampleClassReader index out of range')
+        return self._decode(*_RECORD.unpack_from(
+            self._mmap, _HEADER.size + index * _RECORD.size))
+
+    def __iter__(self) -> Iterator:
+        # unpack the records block by block, copying one block at a time
+        # instead of exporting a buffer of the mmap, which would prevent
+        # closing it while the iterator is alive
+        block_size = _RECORD.size * 65536
+        end = _HEADER.size + self._count * _RECORD.size
+        for start in range(_HEADER.size, end, block_size):
+            block = self._mmap[start:min(start + block_size, end)]
+            for record in _RECORD.iter_unpack(block):
+                yield self._decode(*record)
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mmap.close()
+
+    def __enter__(self) -> 'ExampleClassReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def load_many(path: str, cls: type = ExampleClass,
+              lazy: bool = True) -> Union[ExampleClassReader, list]:
+    """Load instances of :class:`ExampleClass` saved by :func:`save_many`.
+
+    Args:
+        path (str): The path of the file to read.
+        cls (type): The class to decode the records into. Defaults to
+            :class:`ExampleClass`.
+        lazy (bool): Whether to return an :class:`ExampleClassReader` that
+            decodes the records on access, instead of decoding all of them.
+            Defaults to True.
+
+    Returns:
+        ExampleClassReader | list: The lazy reader, which should be closed
+        after use, or the list of decoded instances.
+    """
+    reader = ExampleClassReader(path, cls)
+    if lazy:
+        return reader
+    with reader:
+        return list(reader)
@@ -13,5 +13,8 @@ setup(
     name='docs_example',
     version=get_version(),
     packages=find_packages(),
-    python_requires='>=3.6',
+    python_requires='>=3.7',
+    entry_points={
+        'console_scripts': ['docs-example=docs_example.cli:main'],
+    },
 )